@@ -2,7 +2,16 @@
 # Create Azure AI Foundry agents from YAML definitions
 
 from .yaml_parser import parse_agent_yaml
-from .azure_discovery import AzureDiscovery
-from .agent_builder import AgentBuilder
 
 __all__ = ["parse_agent_yaml", "AzureDiscovery", "AgentBuilder"]
+
+
+def __getattr__(name: str):
+    """Import the Azure-backed classes on first access (PEP 562)."""
+    if name == "AzureDiscovery":
+        from .azure_discovery import AzureDiscovery
+        return AzureDiscovery
+    if name == "AgentBuilder":
+        from .agent_builder import AgentBuilder
+        return AgentBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
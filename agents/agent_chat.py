@@ -0,0 +1,238 @@
+"""
+Agent Chat Module - interactive chat REPL
+
+Shared by test-agent.py and etc/fake-pirate-simple.py: line input and
+the streamed chat loop. Clients come from agent_builder's per-endpoint
+cache, so Azure SDK modules are imported on first use.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .agent_builder import extract_text, get_openai_client
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+# Streamed replies are written in batches: once this many characters are
+# pending, and at least every this many seconds (below what a reader notices)
+STREAM_FLUSH_CHARS = 256
+STREAM_FLUSH_INTERVAL = 0.03
+
+# Chat input history (used when prompt_toolkit is installed)
+HISTORY_FILE = Path.home() / ".azure_agent_history"
+
+# prompt_toolkit session (False when unavailable)
+_PROMPT_SESSION = None
+
+
+def _prompt(message: str) -> str:
+    """
+    Read one line of user input.
+
+    Uses prompt_toolkit (line editing, history kept in HISTORY_FILE) when
+    it is installed and stdin is a terminal, plain input() otherwise.
+    """
+    global _PROMPT_SESSION
+    if _PROMPT_SESSION is None:
+        _PROMPT_SESSION = False
+        if sys.stdin.isatty():
+            try:
+                from prompt_toolkit import PromptSession
+                from prompt_toolkit.history import FileHistory
+                _PROMPT_SESSION = PromptSession(history=FileHistory(str(HISTORY_FILE)))
+            except ImportError:
+                pass
+    if _PROMPT_SESSION is False:
+        return input(message)
+    return _PROMPT_SESSION.prompt(message)
+
+
+class _StreamWriter:
+    """
+    Write streamed text to stdout in batches.
+
+    Text is written once STREAM_FLUSH_CHARS are pending, and a background
+    thread writes whatever is pending every STREAM_FLUSH_INTERVAL - so a
+    pause in the stream never leaves received text unshown.
+    """
+
+    def __init__(self):
+        self._pending: list[str] = []
+        self._pending_len = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+
+    def write(self, text: str):
+        with self._lock:
+            self._pending.append(text)
+            self._pending_len += len(text)
+            if self._pending_len >= STREAM_FLUSH_CHARS:
+                self._flush_locked()
+
+    def close(self):
+        """Stop the flusher thread and write anything still pending."""
+        self._done.set()
+        self._thread.join()
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_periodically(self):
+        while not self._done.wait(STREAM_FLUSH_INTERVAL):
+            with self._lock:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            sys.stdout.write("".join(self._pending))
+            sys.stdout.flush()
+            self._pending.clear()
+            self._pending_len = 0
+
+
+def _stream_reply(openai_client: "OpenAI", agent_name: str, message: str) -> str:
+    """
+    Send a message to an agent and print the reply as it streams in.
+
+    Ctrl+C stops the current reply (the stream is closed) without ending
+    the conversation.
+
+    Returns:
+        The reply text printed so far
+    """
+    chunks = []
+    writer = _StreamWriter()
+    try:
+        with openai_client.responses.stream(
+            input=[{"role": "user", "content": message}],
+            extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
+        ) as stream:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    chunks.append(event.delta)
+                    writer.write(event.delta)
+
+            if not chunks:
+                # No text deltas - fall back to whatever the final response holds
+                chunks.append(extract_text(stream.get_final_response()))
+                writer.write(chunks[-1])
+    except KeyboardInterrupt:
+        writer.write(" [interrupted]")
+    finally:
+        # Also reached on errors, so text already received is never lost
+        writer.close()
+    print()
+    return "".join(chunks)
+
+
+def batch_prompts(script: Optional[str] = None, turns: Optional[int] = None, prompt: str = "Hello!") -> Optional[list[str]]:
+    """
+    Messages for a non-interactive chat (see run_chat's prompts).
+
+    Args:
+        script: File with one message per line ('-' reads stdin)
+        turns: Send `prompt` this many times (ignored with script)
+        prompt: Message repeated by turns
+
+    Returns:
+        The messages, or None for an interactive chat
+    """
+    if script:
+        lines = sys.stdin.read().splitlines() if script == "-" else Path(script).read_text().splitlines()
+        return [line.strip() for line in lines if line.strip()]
+    if turns is not None:
+        return [prompt] * turns
+    return None
+
+
+def run_chat(
+    endpoint: str,
+    agent_name: str,
+    greeting: Optional[str] = None,
+    farewell: str = "\n👋 Goodbye!",
+    interrupted: str = "\n\n👋 Conversation interrupted. Goodbye!",
+    speaker: Optional[str] = None,
+    prompt: str = "\nYou: ",
+    prompts: Optional[Iterable[str]] = None,
+) -> Optional[Exception]:
+    """
+    Chat with an agent until the user types exit/quit or presses Ctrl+C.
+
+    With `prompts`, the messages are sent one after another instead of
+    being read from the user (batch/benchmark mode) and the total time
+    is printed at the end.
+
+    Args:
+        endpoint: Project endpoint URL
+        agent_name: Agent to talk to
+        greeting: Printed once the client is ready (default names the agent)
+        farewell: Printed on exit/quit or end of input
+        interrupted: Printed when Ctrl+C is pressed at the prompt
+        speaker: Label printed before each reply (default: agent_name)
+        prompt: Input prompt
+        prompts: Messages to send instead of reading input
+
+    Returns:
+        The error that ended the chat, or None if the user left
+    """
+    try:
+        openai_client = get_openai_client(endpoint)
+    except Exception as e:
+        print(f"\n❌ Error: Could not initialize OpenAI client: {e}")
+        print("   Make sure your Azure credentials are configured (az login)")
+        return e
+
+    if greeting is None:
+        greeting = f"\n💬 Starting conversation with '{agent_name}'"
+    print(greeting)
+    if prompts is None:
+        print("   Type 'exit' or 'quit' to end; Ctrl+C stops a reply (or exits at the prompt)\n")
+    print("-" * 50)
+
+    batch = iter(prompts) if prompts is not None else None
+    turns = 0
+    started = time.perf_counter()
+    while True:
+        try:
+            if batch is None:
+                user_input = _prompt(prompt).strip()
+            else:
+                user_input = next(batch, "exit")
+                if user_input != "exit":
+                    print(f"{prompt}{user_input}")
+
+            if user_input.lower() in ['exit', 'quit']:
+                if batch is not None:
+                    print(f"\n⏱️  {turns} turn(s) in {time.perf_counter() - started:.2f}s")
+                print(farewell)
+                return None
+
+            if not user_input:
+                continue
+
+            # Stream the response from the agent
+            try:
+                print(f"\n{speaker or agent_name}: ", end="", flush=True)
+                _stream_reply(openai_client, agent_name, user_input)
+                turns += 1
+
+            except Exception as chat_error:
+                # The agent isn't looked up beforehand, so a wrong name shows up here
+                if getattr(chat_error, "status_code", None) == 404:
+                    print(f"\n❌ Error: Could not find agent '{agent_name}': {chat_error}")
+                else:
+                    print(f"\n❌ Chat error: {chat_error}")
+                return chat_error
+
+        except KeyboardInterrupt:
+            print(interrupted)
+            return None
+        except EOFError:
+            print(farewell)
+            return None
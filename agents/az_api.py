@@ -0,0 +1,325 @@
+"""
+Azure API Module - direct ARM REST calls
+
+Account, identity, role, quota, resource, deployment and key lookups made
+with a shared azure-identity credential instead of spawning an az process
+per query. One ARM token is reused until it nears expiry and all requests
+share a pooled HTTPS connection.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+# orjson parses large ARM payloads several times faster; both accept bytes
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_SCOPE = f"{ARM_ENDPOINT}/.default"
+SUBSCRIPTIONS_API_VERSION = "2022-12-01"
+RESOURCES_API_VERSION = "2021-04-01"
+AUTHORIZATION_API_VERSION = "2022-04-01"
+COGNITIVE_API_VERSION = "2023-05-01"
+
+# Built-in role definition GUIDs (identical in every tenant); any other
+# role id is resolved to its name with an ARM lookup
+KNOWN_ROLE_IDS = {
+    "8e3af657-a8ff-443c-a75c-2fe8c4bcb635": "Owner",
+    "b24988ac-6180-42a0-ab88-20f7382dd24c": "Contributor",
+    "53ca6127-db72-4b80-b1b0-d745d6d5456d": "Azure AI User",
+}
+
+# Reused across calls: (credential id, token, expires_on) and one HTTP pool
+_TOKEN: Optional[tuple[int, str, int]] = None
+_TOKEN_LOCK = threading.Lock()
+_HTTP: Optional["httpx.Client"] = None
+_HTTP_LOCK = threading.Lock()
+_SUBSCRIPTION: Optional[dict] = None
+
+
+def _get_token(credential) -> str:
+    """ARM bearer token, cached until five minutes before expiry."""
+    global _TOKEN
+    # Locked so concurrent lookups wait for one token instead of each fetching one
+    with _TOKEN_LOCK:
+        if _TOKEN is None or _TOKEN[0] != id(credential) or time.time() > _TOKEN[2] - 300:
+            access_token = credential.get_token(ARM_SCOPE)
+            _TOKEN = (id(credential), access_token.token, access_token.expires_on)
+        return _TOKEN[1]
+
+
+def _http() -> "httpx.Client":
+    """Shared HTTP client (keeps the ARM connection alive between calls)."""
+    global _HTTP
+    if _HTTP is None:
+        # Locked so concurrent first calls share one pool instead of leaking extras
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                import httpx
+                _HTTP = httpx.Client(base_url=ARM_ENDPOINT, timeout=30)
+    return _HTTP
+
+
+def _arm_get(credential, url: str, params: Optional[dict] = None) -> dict:
+    """GET an ARM path or URL and return the JSON body."""
+    response = _http().get(url, params=params, headers={"Authorization": f"Bearer {_get_token(credential)}"})
+    response.raise_for_status()
+    return _json_loads(response.content)
+
+
+def _arm_post(credential, url: str, params: Optional[dict] = None) -> dict:
+    """POST (no body) to an ARM action such as listKeys and return the JSON body."""
+    response = _http().post(url, params=params, headers={"Authorization": f"Bearer {_get_token(credential)}"})
+    response.raise_for_status()
+    return _json_loads(response.content)
+
+
+def _arm_iter(credential, url: str, params: Optional[dict] = None) -> Iterator[dict]:
+    """Yield items from an ARM list endpoint, fetching nextLink pages only as needed."""
+    while url:
+        data = _arm_get(credential, url, params)
+        yield from data.get("value", [])
+        # nextLink already carries the query string
+        url, params = data.get("nextLink"), None
+
+
+def _arm_list(credential, url: str, params: Optional[dict] = None) -> list[dict]:
+    """GET an ARM list endpoint, following nextLink pages."""
+    return list(_arm_iter(credential, url, params))
+
+
+def decode_token_claims(token: str) -> dict:
+    """Decode the payload of a JWT access token (no signature check - display/lookup only)."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))
+
+
+def azure_profile_path() -> Path:
+    """az's profile file (logged-in accounts and the default subscription)."""
+    return Path(os.environ.get("AZURE_CONFIG_DIR", Path.home() / ".azure")) / "azureProfile.json"
+
+
+def _default_subscription_id() -> Optional[str]:
+    """Default subscription from az's profile file (what `az account show` reports)."""
+    try:
+        # az writes this file with a UTF-8 BOM
+        profile = json.loads(azure_profile_path().read_text(encoding="utf-8-sig"))
+    except (OSError, ValueError):
+        return None
+
+    for subscription in profile.get("subscriptions", []):
+        if subscription.get("isDefault"):
+            return subscription.get("id")
+    return None
+
+
+def get_subscription(credential) -> Optional[dict]:
+    """
+    Get the current subscription without running `az account show`.
+
+    The subscription id is az's default - the one discovery and
+    `az account show` use - and one ARM call confirms the credential can
+    use it and fetches its name.
+
+    Args:
+        credential: azure-identity credential
+
+    Returns:
+        {"id": ..., "name": ...} or None if not logged in / not found
+    """
+    global _SUBSCRIPTION
+    if _SUBSCRIPTION is not None:
+        return _SUBSCRIPTION
+
+    subscription_id = _default_subscription_id()
+    if not subscription_id:
+        return None
+
+    try:
+        data = _arm_get(
+            credential, f"/subscriptions/{subscription_id}",
+            params={"api-version": SUBSCRIPTIONS_API_VERSION},
+        )
+    except Exception:
+        return None
+
+    _SUBSCRIPTION = {"id": data.get("subscriptionId", subscription_id), "name": data.get("displayName")}
+    return _SUBSCRIPTION
+
+
+def get_signed_in_user(credential) -> Optional[dict]:
+    """
+    Identify the signed-in user from the claims of an ARM token.
+
+    Args:
+        credential: azure-identity credential
+
+    Returns:
+        {"id": object id, "upn": display name}, or None for service
+        principals / when no token is available
+    """
+    try:
+        claims = decode_token_claims(_get_token(credential))
+    except Exception:
+        return None
+
+    user_id = claims.get("oid")
+    if not user_id or claims.get("idtyp") == "app":
+        return None
+
+    upn = claims.get("upn") or claims.get("unique_name") or claims.get("preferred_username") or user_id
+    return {"id": user_id, "upn": upn}
+
+
+def get_role_name(credential, role_definition_id: str) -> Optional[str]:
+    """
+    Resolve a role definition id to its name (built-ins without a lookup).
+
+    Args:
+        credential: azure-identity credential
+        role_definition_id: Full ARM id of the role definition
+
+    Returns:
+        Role name, or None if the definition has none
+    """
+    role_name = KNOWN_ROLE_IDS.get(role_definition_id.rsplit("/", 1)[-1])
+    if role_name is None:
+        definition = _arm_get(credential, role_definition_id, params={"api-version": AUTHORIZATION_API_VERSION})
+        role_name = definition.get("properties", {}).get("roleName")
+    return role_name
+
+
+def iter_role_assignments(
+    credential, subscription_id: str, principal_id: str, resolve_names: bool = True
+) -> Iterator[dict]:
+    """
+    Yield a principal's direct role assignments at, above or below a subscription.
+
+    Assignments are yielded as soon as their role name is known, so a
+    caller that stops early skips the remaining pages and role-definition
+    lookups.
+
+    Args:
+        credential: azure-identity credential
+        subscription_id: Subscription to query
+        principal_id: User/service principal object id
+        resolve_names: Look up names of roles not in KNOWN_ROLE_IDS; if
+            False their role_name is None (see get_role_name)
+
+    Yields:
+        {"scope": ..., "role_definition_id": ..., "role_name": ...}
+    """
+    assignments = _arm_iter(
+        credential,
+        f"/subscriptions/{subscription_id}/providers/Microsoft.Authorization/roleAssignments",
+        params={
+            "api-version": AUTHORIZATION_API_VERSION,
+            "$filter": f"principalId eq '{principal_id}'",
+        },
+    )
+
+    for assignment in assignments:
+        props = assignment.get("properties", {})
+        role_definition_id = props.get("roleDefinitionId", "")
+        if resolve_names:
+            role_name = get_role_name(credential, role_definition_id)
+        else:
+            role_name = KNOWN_ROLE_IDS.get(role_definition_id.rsplit("/", 1)[-1])
+        yield {"scope": props.get("scope", ""), "role_definition_id": role_definition_id, "role_name": role_name}
+
+
+def list_role_assignments(credential, subscription_id: str, principal_id: str) -> list[dict]:
+    """
+    List a principal's direct role assignments at, above or below a subscription.
+
+    Returns:
+        List of {"scope": ..., "role_definition_id": ..., "role_name": ...}
+        (see iter_role_assignments)
+    """
+    return list(iter_role_assignments(credential, subscription_id, principal_id))
+
+
+def list_quota_usage(credential, subscription_id: str, location: str) -> list[dict]:
+    """
+    List Cognitive Services quota usage for a region.
+
+    Args:
+        credential: azure-identity credential
+        subscription_id: Subscription to query
+        location: Azure region (e.g., 'swedencentral')
+
+    Returns:
+        Usage entries as returned by ARM (name.value, currentValue, limit)
+    """
+    return _arm_list(
+        credential,
+        f"/subscriptions/{subscription_id}/providers/Microsoft.CognitiveServices/locations/{location}/usages",
+        params={"api-version": COGNITIVE_API_VERSION},
+    )
+
+
+def list_resources(credential, subscription_id: str, odata_filter: Optional[str] = None) -> list[dict]:
+    """
+    List resources in a subscription.
+
+    Args:
+        credential: azure-identity credential
+        subscription_id: Subscription to query
+        odata_filter: Optional $filter (e.g. "resourceType eq '...'"),
+            applied by ARM so unwanted resources are never paged through
+
+    Returns:
+        Resources as returned by ARM (name, id, type, location, ...)
+    """
+    params = {"api-version": RESOURCES_API_VERSION}
+    if odata_filter:
+        params["$filter"] = odata_filter
+    return _arm_list(credential, f"/subscriptions/{subscription_id}/resources", params=params)
+
+
+def _account_path(subscription_id: str, resource_group: str, account_name: str) -> str:
+    """ARM path of a Cognitive Services account."""
+    return (
+        f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
+        f"/providers/Microsoft.CognitiveServices/accounts/{account_name}"
+    )
+
+
+def list_account_deployments(credential, subscription_id: str, resource_group: str, account_name: str) -> list[dict]:
+    """
+    List model deployments of a Cognitive Services account.
+
+    Returns:
+        Deployments as returned by ARM (name, properties.model.name/version)
+    """
+    return _arm_list(
+        credential,
+        _account_path(subscription_id, resource_group, account_name) + "/deployments",
+        params={"api-version": COGNITIVE_API_VERSION},
+    )
+
+
+def list_account_keys(credential, subscription_id: str, resource_group: str, account_name: str) -> dict:
+    """
+    Get the API keys of a Cognitive Services account.
+
+    Returns:
+        {"key1": ..., "key2": ...}
+    """
+    return _arm_post(
+        credential,
+        _account_path(subscription_id, resource_group, account_name) + "/listKeys",
+        params={"api-version": COGNITIVE_API_VERSION},
+    )
@@ -3,15 +3,107 @@ Agent Builder Module - Azure AI Projects SDK
 
 Creates Azure AI Foundry agents using the azure-ai-projects SDK.
 Uses prompt-based agents with AgentDefinition and AgentKind.PROMPT.
+
+Azure SDK modules are imported inside the methods that use them, so
+importing this module (or the agents package) stays cheap.
 """
 
+import asyncio
+import os
 from dataclasses import dataclass
-from typing import Optional
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Optional
+
+from .yaml_parser import AgentConfig
+
+if TYPE_CHECKING:
+    from azure.identity import DefaultAzureCredential
+    from azure.ai.projects import AIProjectClient
+    from openai import OpenAI
+
+
+def _env_retries(name: str) -> Optional[int]:
+    """Non-negative retry count from an environment variable (None if unset/invalid)."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return max(0, int(value))
+    except ValueError:
+        print(f"⚠️  Ignoring {name}={value!r} (expected a whole number), using the SDK defaults")
+        return None
+
+
+# Retries for transient failures (408/429/5xx, honoring Retry-After) on every
+# SDK call; both the azure-core pipeline and the OpenAI client back off
+# exponentially with jitter. Unset keeps each SDK's own defaults.
+MAX_RETRIES = _env_retries("AGENT_MAX_RETRIES")
+RETRY_BACKOFF_MAX = 30
+
+# Shared across AgentBuilder instances and the chat scripts so the
+# credential's token cache and each endpoint's HTTP pipeline are built once
+# per process
+_CREDENTIAL: Optional["DefaultAzureCredential"] = None
+_CLIENT_CACHE: dict[str, "AIProjectClient"] = {}
+_OPENAI_CLIENT_CACHE: dict[str, "OpenAI"] = {}
+
+
+def get_credential() -> "DefaultAzureCredential":
+    """Get or create the process-wide DefaultAzureCredential."""
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        from azure.identity import DefaultAzureCredential
+        _CREDENTIAL = DefaultAzureCredential()
+    return _CREDENTIAL
+
 
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import AgentDefinition, AgentKind
-from azure.core.exceptions import ResourceExistsError
+def get_project_client(endpoint: str) -> "AIProjectClient":
+    """Get or create the AIProjectClient for an endpoint (shared per process)."""
+    endpoint = endpoint.rstrip("/")
+    client = _CLIENT_CACHE.get(endpoint)
+    if client is None:
+        from azure.ai.projects import AIProjectClient
+        kwargs = {}
+        if MAX_RETRIES is not None:
+            kwargs.update(retry_total=MAX_RETRIES, retry_backoff_max=RETRY_BACKOFF_MAX)
+        client = AIProjectClient(credential=get_credential(), endpoint=endpoint, **kwargs)
+        _CLIENT_CACHE[endpoint] = client
+    return client
+
+
+def get_openai_client(endpoint: str) -> "OpenAI":
+    """
+    Get or create the OpenAI client for the responses API (shared per endpoint).
+    
+    Reusing it keeps its connection pool warm across calls. When the
+    optional `h2` package is installed the client speaks HTTP/2, so every
+    turn stays on one connection.
+    """
+    endpoint = endpoint.rstrip("/")
+    openai_client = _OPENAI_CLIENT_CACHE.get(endpoint)
+    if openai_client is None:
+        client = get_project_client(endpoint)
+        kwargs = {}
+        if MAX_RETRIES is not None:
+            kwargs["max_retries"] = MAX_RETRIES
+        # The SDK supplies its own http_client when console logging is on
+        if find_spec("h2") is not None and not getattr(client, "_console_logging_enabled", False):
+            from openai import DefaultHttpxClient
+            kwargs["http_client"] = DefaultHttpxClient(http2=True)
+        openai_client = client.get_openai_client(**kwargs)
+        _OPENAI_CLIENT_CACHE[endpoint] = openai_client
+    return openai_client
+
+
+def extract_text(response) -> str:
+    """Text of a responses API result (output_text, else first output item)."""
+    text = getattr(response, "output_text", None)
+    if text is not None:
+        return text
+    output = getattr(response, "output", None)
+    if output:
+        return str(output[0] if isinstance(output, list) else output)
+    return str(response)
 
 
 @dataclass
@@ -52,18 +144,19 @@ class AgentBuilder:
                 e.g., "https://resource.services.ai.azure.com/api/projects/project"
         """
         self.endpoint = endpoint.rstrip("/")
-        self.credential = DefaultAzureCredential()
+        self.credential = get_credential()
         self._client = None
     
-    def _get_client(self) -> AIProjectClient:
-        """Get or create the AIProjectClient."""
+    def _get_client(self) -> "AIProjectClient":
+        """Get or create the AIProjectClient (shared per endpoint)."""
         if self._client is None:
-            self._client = AIProjectClient(
-                credential=self.credential,
-                endpoint=self.endpoint,
-            )
+            self._client = get_project_client(self.endpoint)
         return self._client
     
+    def _get_openai_client(self) -> "OpenAI":
+        """Get or create the OpenAI client for the responses API (shared per endpoint)."""
+        return get_openai_client(self.endpoint)
+    
     def create_agent(
         self,
         model: str,
@@ -72,6 +165,8 @@ class AgentBuilder:
         description: str = "",
         resource_group: str = "",
         project_name: str = "",
+        prompt_on_conflict: bool = True,
+        verify: bool = False,
         **kwargs,
     ) -> CreatedAgent:
         """
@@ -84,6 +179,9 @@ class AgentBuilder:
             description: Optional description
             resource_group: Optional resource group name for display
             project_name: Optional project name for display
+            prompt_on_conflict: Ask for a new name if the agent already
+                exists; if False, raise RuntimeError instead
+            verify: Re-fetch the agent after creation to confirm it exists
             
         Returns:
             CreatedAgent with agent details
@@ -91,6 +189,9 @@ class AgentBuilder:
         print(f"\n📦 Creating agent '{name}'...")
         print(f"   Model: {model}")
         
+        from azure.ai.projects.models import AgentDefinition, AgentKind
+        from azure.core.exceptions import ResourceExistsError
+        
         client = self._get_client()
         
         # Build agent definition for prompt-based agent
@@ -110,23 +211,27 @@ class AgentBuilder:
                 break
             except ResourceExistsError:
                 print(f"\n⚠️  Agent '{current_name}' already exists.")
+                if not prompt_on_conflict:
+                    raise RuntimeError(f"Agent '{current_name}' already exists.")
                 new_name = input("Enter a different name (or 'q' to cancel): ").strip()
                 if new_name.lower() == 'q' or not new_name:
                     raise RuntimeError(f"Agent creation cancelled - name '{current_name}' already exists.")
                 current_name = new_name
                 print(f"\n📦 Trying with name '{current_name}'...")
-                # Force fresh client to avoid any SDK caching issues
-                self._client = None
-                client = self._get_client()
         
-        # Verify the agent was actually created
-        try:
-            verified = client.agents.get(agent_name=current_name)
-            if not verified or not verified.get('id'):
-                raise RuntimeError(f"Agent '{current_name}' creation could not be verified")
-            print(f"\n✅ Verified agent '{current_name}' exists")
-        except Exception as e:
-            raise RuntimeError(f"Agent '{current_name}' was not created: {e}")
+        # The create response already describes the agent
+        if not agent or not agent.get('id'):
+            raise RuntimeError(f"Agent '{current_name}' was not created: empty response")
+        
+        # Optional extra round trip for callers that want server-side confirmation
+        if verify:
+            try:
+                verified = client.agents.get(agent_name=current_name)
+                if not verified or not verified.get('id'):
+                    raise RuntimeError(f"Agent '{current_name}' creation could not be verified")
+                print(f"\n✅ Verified agent '{current_name}' exists")
+            except Exception as e:
+                raise RuntimeError(f"Agent '{current_name}' was not created: {e}")
         
         return CreatedAgent(
             agent_id=agent.get('id'),
@@ -170,11 +275,9 @@ class AgentBuilder:
         Returns:
             Agent response or None if failed
         """
-        client = self._get_client()
-        
         try:
             # Get OpenAI client for responses
-            openai_client = client.get_openai_client()
+            openai_client = self._get_openai_client()
             
             # Use responses.create with agent reference
             response = openai_client.responses.create(
@@ -182,21 +285,66 @@ class AgentBuilder:
                 extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
             )
             
-            # Extract the response text
-            if hasattr(response, 'output_text'):
-                return response.output_text
-            elif hasattr(response, 'output') and response.output:
-                return response.output[0] if isinstance(response.output, list) else str(response.output)
-            else:
-                return str(response)
+            return extract_text(response)
                 
         except Exception as e:
             return f"Error: {e}"
+    
+    async def acreate_agent(self, model: str, name: str, instructions: str, **kwargs) -> CreatedAgent:
+        """
+        Async create_agent for concurrent workflows.
+        
+        Runs the blocking SDK call in a worker thread so several creations
+        can overlap their network waits. Name conflicts raise instead of
+        prompting, since concurrent prompts would interleave.
+        """
+        kwargs.setdefault("prompt_on_conflict", False)
+        return await asyncio.to_thread(self.create_agent, model, name, instructions, **kwargs)
+    
+    async def atest_agent(self, agent_name: str, message: str = "Hello!") -> Optional[str]:
+        """Async test_agent (runs the blocking call in a worker thread)."""
+        return await asyncio.to_thread(self.test_agent, agent_name, message)
+    
+    async def alist_agents(self) -> list[dict]:
+        """Async list_agents (runs the blocking call in a worker thread)."""
+        return await asyncio.to_thread(self.list_agents)
+    
+    async def bulk_create(
+        self,
+        configs: list[AgentConfig],
+        model: str = "",
+        concurrency: int = 4,
+    ) -> list[CreatedAgent | Exception]:
+        """
+        Create several agents concurrently.
+        
+        Args:
+            configs: Parsed agent definitions
+            model: Deployment to use when a config has no model hint
+            concurrency: Maximum creations in flight at once
+            
+        Returns:
+            One entry per config, in order: the CreatedAgent, or the
+            exception that creation raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def create_one(config: AgentConfig) -> CreatedAgent:
+            async with semaphore:
+                return await self.acreate_agent(
+                    model=config.model_hint or model,
+                    name=config.name,
+                    instructions=config.instructions,
+                    description=config.description,
+                )
+        
+        return await asyncio.gather(
+            *(create_one(c) for c in configs),
+            return_exceptions=True,
+        )
 
 
 if __name__ == "__main__":
-    import os
-    
     endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT", "")
     if not endpoint:
         print("Set AZURE_AI_PROJECT_ENDPOINT environment variable")
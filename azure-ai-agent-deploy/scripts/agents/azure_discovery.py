@@ -1,42 +1,113 @@
 """
 Azure Discovery Module
 
-Discovers Azure AI resources, projects, and deployments using az CLI.
+Discovers Azure AI resources, projects, and deployments through ARM.
 Replicates shell script logic in Python for programmatic use.
+
+Resource, deployment and key lookups go straight to ARM instead of
+spawning an az process per call: through the Azure management SDKs when
+installed (pip install azure-mgmt-cognitiveservices azure-mgmt-resource),
+otherwise through az_api's REST client. Login and subscription discovery
+always use az.
 """
 
-import json
+import os
+import shutil
 import subprocess
-from dataclasses import dataclass
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib.util import find_spec
 from typing import Optional
 
+from .agent_builder import get_credential
+from .az_api import list_account_deployments, list_account_keys, list_resources
+
+
+def _is_installed(module: str) -> bool:
+    """Whether a module can be imported, without importing it."""
+    try:
+        return find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+# Optional management SDKs - fall back to az_api's REST calls when missing.
+# Only located here; the (slow) imports happen on first use.
+_HAS_MGMT_SDK = _is_installed("azure.mgmt.cognitiveservices") and _is_installed("azure.mgmt.resource")
+
+
+# ARM resource types for AI resources and Foundry projects
+RESOURCE_TYPE = "Microsoft.CognitiveServices/accounts"
+PROJECT_TYPE = "Microsoft.CognitiveServices/accounts/projects"
+
+# Server-side filter for ARM resource listings: only AI resources and projects
+COGNITIVE_TYPES_FILTER = f"resourceType eq '{RESOURCE_TYPE}' or resourceType eq '{PROJECT_TYPE}'"
+
+# Set once az has been found on PATH, so later AzureDiscovery() calls skip the lookup
+_AZ_CHECKED = False
+
+# Environment for az child processes. Telemetry collection adds work to every
+# invocation, so it is switched off; captured output is also forced to plain
+# JSON without colour codes or warnings.
+AZ_INTERACTIVE_ENV = {**os.environ, "AZURE_CORE_COLLECT_TELEMETRY": "no"}
+AZ_ENV = {
+    **AZ_INTERACTIVE_ENV,
+    "AZURE_CORE_OUTPUT": "json",
+    "AZURE_CORE_NO_COLOR": "true",
+    "AZURE_CORE_ONLY_SHOW_ERRORS": "true",
+}
+
+# Upper bound on concurrent ARM lookups (worker threads), to stay clear of
+# ARM throttling
+MAX_AZ_WORKERS = 8
+
+# Resources whose deployments are prefetched while the project menu is shown
+PREFETCH_LIMIT = 8
 
-@dataclass
+# Management SDK clients, shared per (client class, subscription id)
+_MGMT_CLIENTS: dict[tuple[type, str], object] = {}
+
+
+def _get_mgmt_client(client_cls: type, subscription_id: str):
+    """Get or create a cached management SDK client for a subscription."""
+    key = (client_cls, subscription_id)
+    if key not in _MGMT_CLIENTS:
+        _MGMT_CLIENTS[key] = client_cls(get_credential(), subscription_id)
+    return _MGMT_CLIENTS[key]
+
+
+@dataclass(slots=True, frozen=True)
 class AzureResource:
     """Azure AI resource (Cognitive Services account)."""
     name: str
     resource_group: str
     location: str
+    endpoint: str = field(init=False, repr=False, compare=False)
     
-    @property
-    def endpoint(self) -> str:
-        return f"https://{self.name}.cognitiveservices.azure.com/"
+    def __post_init__(self):
+        # Built once; frozen instances make this safe to cache
+        object.__setattr__(self, "endpoint", f"https://{self.name}.cognitiveservices.azure.com/")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AzureProject:
     """Azure AI Foundry project."""
     name: str
     resource_name: str
     resource_group: str
     location: str
+    endpoint: str = field(init=False, repr=False, compare=False)
     
-    @property
-    def endpoint(self) -> str:
-        return f"https://{self.resource_name}.services.ai.azure.com/api/projects/{self.name}"
+    def __post_init__(self):
+        # Built once; frozen instances make this safe to cache
+        object.__setattr__(
+            self, "endpoint",
+            f"https://{self.resource_name}.services.ai.azure.com/api/projects/{self.name}",
+        )
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class ModelDeployment:
     """Deployed model in Azure AI resource."""
     deployment_name: str
@@ -45,29 +116,38 @@ class ModelDeployment:
 
 
 class AzureDiscovery:
-    """Discover Azure AI resources using az CLI."""
+    """Discover Azure AI resources via ARM (management SDKs or REST), logging in with az."""
     
     def __init__(self):
         self._check_cli()
+        self._use_sdk = _HAS_MGMT_SDK
+        self._subscription_id: Optional[str] = None
+        self._cognitive_resources: Optional[list[dict]] = None
+        # Background deployment lookups started by prefetch_deployments()
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetched: dict[tuple[str, str], Future] = {}
     
     def _check_cli(self):
-        """Check if az CLI is available."""
-        result = subprocess.run(["az", "--version"], capture_output=True)
-        if result.returncode != 0:
+        """Check if az CLI is available (PATH lookup, once per process)."""
+        global _AZ_CHECKED
+        if _AZ_CHECKED:
+            return
+        if shutil.which("az") is None:
             raise RuntimeError("Azure CLI (az) not found. Install from: https://aka.ms/installazurecli")
+        _AZ_CHECKED = True
     
     def _run_az(self, args: list[str], check: bool = True) -> subprocess.CompletedProcess:
-        """Run az CLI command."""
+        """Run az CLI command (stdout/stderr are left as raw bytes)."""
         cmd = ["az"] + args
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, env=AZ_ENV)
         if check and result.returncode != 0:
-            raise RuntimeError(f"az command failed: {result.stderr}")
+            raise RuntimeError(f"az command failed: {result.stderr.decode(errors='replace')}")
         return result
     
     def is_logged_in(self) -> bool:
         """Check if user is logged in to Azure."""
-        result = self._run_az(["account", "show"], check=False)
-        return result.returncode == 0
+        result = self._run_az(["account", "show", "--query", "id", "-o", "tsv"], check=False)
+        return result.returncode == 0 and bool(result.stdout.strip())
     
     def login_device_code(self) -> bool:
         """
@@ -83,6 +163,7 @@ class AzureDiscovery:
         result = subprocess.run(
             ["az", "login", "--use-device-code"],
             # Don't capture output so user sees the device code
+            env=AZ_INTERACTIVE_ENV,
         )
         
         return result.returncode == 0
@@ -100,47 +181,131 @@ class AzureDiscovery:
     
     def get_subscription(self) -> dict:
         """Get current subscription info."""
+        # Plain text - no JSON to build or parse. tsv prints each element of
+        # a top-level list on its own line
         result = self._run_az([
             "account", "show",
-            "--query", "{name:name, id:id}",
-            "-o", "json"
+            "--query", "[id, name]",
+            "-o", "tsv"
         ])
-        return json.loads(result.stdout)
+        lines = result.stdout.decode().splitlines()
+        subscription_id = lines[0].strip() if lines else ""
+        name = lines[1].strip() if len(lines) > 1 else ""
+        self._subscription_id = subscription_id
+        return {"name": name, "id": subscription_id}
     
-    def list_resources(self, filter_term: str = "") -> list[AzureResource]:
+    def _get_subscription_id(self) -> str:
+        """Current subscription id (az lookup cached on the instance)."""
+        if self._subscription_id is None:
+            self.get_subscription()
+        return self._subscription_id
+    
+    def _mgmt_client(self, client_cls: type):
+        """Management SDK client for the current az subscription."""
+        return _get_mgmt_client(client_cls, self._get_subscription_id())
+    
+    def _list_cognitive_resources(self) -> list[dict]:
         """
-        List Azure AI resources (CognitiveServices accounts).
+        Fetch AI resources and projects with a single ARM listing.
+        
+        ARM filters by resource type server-side, so only the two wanted
+        types are paged through. The raw result is cached on the instance
+        so list_resources() and list_projects() share one ARM round trip.
+        """
+        if self._cognitive_resources is not None:
+            return self._cognitive_resources
+        
+        try:
+            if self._use_sdk:
+                from azure.mgmt.resource import ResourceManagementClient
+                client = self._mgmt_client(ResourceManagementClient)
+                listed = [
+                    (r.name, r.id, r.location, r.type)
+                    for r in client.resources.list(filter=COGNITIVE_TYPES_FILTER)
+                ]
+            else:
+                listed = [
+                    (r.get("name"), r.get("id"), r.get("location"), r.get("type"))
+                    for r in list_resources(get_credential(), self._get_subscription_id(), COGNITIVE_TYPES_FILTER)
+                ]
+        except Exception as e:
+            raise RuntimeError(f"Could not list Azure AI resources: {e}") from e
+        
+        wanted = {RESOURCE_TYPE.lower(): RESOURCE_TYPE, PROJECT_TYPE.lower(): PROJECT_TYPE}
+        self._cognitive_resources = [
+            {
+                "name": name,
+                # id is /subscriptions/<sub>/resourceGroups/<rg>/providers/...
+                "rg": resource_id.split("/")[4],
+                "loc": location,
+                "type": wanted[resource_type.lower()],
+            }
+            for name, resource_id, location, resource_type in listed
+            if resource_type and resource_type.lower() in wanted
+        ]
+        return self._cognitive_resources
+    
+    def list_resources_and_projects(self, filter_term: str = "") -> tuple[list[AzureResource], list[AzureProject]]:
+        """
+        List Azure AI resources and Foundry projects together.
         
         Args:
-            filter_term: Optional filter for resource name or resource group
+            filter_term: Optional filter for resource/project name or resource group
             
         Returns:
-            List of AzureResource objects
+            (resources, projects) lists
         """
-        result = self._run_az([
-            "resource", "list",
-            "--resource-type", "Microsoft.CognitiveServices/accounts",
-            "--query", "[].{name:name, rg:resourceGroup, loc:location}",
-            "-o", "json"
-        ])
-        
-        resources_data = json.loads(result.stdout)
         resources = []
+        projects = []
+        ft = filter_term.lower()
         
-        for r in resources_data:
-            # Apply filter
-            if filter_term:
-                if filter_term.lower() not in r["name"].lower() and \
-                   filter_term.lower() not in r["rg"].lower():
+        for r in self._list_cognitive_resources():
+            rg_l = r["rg"].lower()
+            
+            if r["type"] == RESOURCE_TYPE:
+                # Apply filter
+                if ft and ft not in r["name"].lower() and ft not in rg_l:
                     continue
+                
+                resources.append(AzureResource(
+                    name=r["name"],
+                    resource_group=r["rg"],
+                    location=r["loc"]
+                ))
+                continue
+            
+            # Project name is "resource/project"
+            parts = r["name"].split("/")
+            if len(parts) != 2:
+                continue
+            
+            resource_name, project_name = parts
             
-            resources.append(AzureResource(
-                name=r["name"],
+            # Apply filter
+            if ft and ft not in resource_name.lower() and \
+               ft not in project_name.lower() and ft not in rg_l:
+                continue
+            
+            projects.append(AzureProject(
+                name=project_name,
+                resource_name=resource_name,
                 resource_group=r["rg"],
                 location=r["loc"]
             ))
         
-        return resources
+        return resources, projects
+    
+    def list_resources(self, filter_term: str = "") -> list[AzureResource]:
+        """
+        List Azure AI resources (CognitiveServices accounts).
+        
+        Args:
+            filter_term: Optional filter for resource name or resource group
+            
+        Returns:
+            List of AzureResource objects
+        """
+        return self.list_resources_and_projects(filter_term)[0]
     
     def list_projects(self, filter_term: str = "") -> list[AzureProject]:
         """
@@ -152,44 +317,89 @@ class AzureDiscovery:
         Returns:
             List of AzureProject objects
         """
-        result = self._run_az([
-            "resource", "list",
-            "--resource-type", "Microsoft.CognitiveServices/accounts/projects",
-            "--query", "[].{fullName:name, rg:resourceGroup, loc:location}",
-            "-o", "json"
-        ])
+        return self.list_resources_and_projects(filter_term)[1]
+    
+    def _resolve_shared_state(self):
+        """
+        Resolve the subscription and mgmt client before deployment lookups
+        fan out, so worker threads don't each start their own
+        `az account show` (az_api's token fetch is already serialized).
+        """
+        if self._use_sdk:
+            from azure.mgmt.cognitiveservices import CognitiveServicesManagementClient
+            self._mgmt_client(CognitiveServicesManagementClient)
+        else:
+            self._get_subscription_id()
+    
+    def prefetch_deployments(
+        self,
+        projects: list[AzureProject],
+        max_workers: int = 4,
+        limit: int = PREFETCH_LIMIT,
+    ):
+        """
+        Start listing deployments for the projects' resources in the background.
         
-        projects_data = json.loads(result.stdout)
-        projects = []
+        Meant to run while the user reads a project menu; the next
+        list_deployments() call for one of these resources picks up the
+        result instead of starting a new lookup. Call cancel_prefetch()
+        once a project is chosen (or the flow gives up).
         
-        for p in projects_data:
-            # fullName is "resource/project"
-            parts = p["fullName"].split("/")
-            if len(parts) != 2:
-                continue
-            
-            resource_name, project_name = parts
-            
-            # Apply filter
-            if filter_term:
-                if filter_term.lower() not in resource_name.lower() and \
-                   filter_term.lower() not in project_name.lower() and \
-                   filter_term.lower() not in p["rg"].lower():
-                    continue
-            
-            projects.append(AzureProject(
-                name=project_name,
-                resource_name=resource_name,
-                resource_group=p["rg"],
-                location=p["loc"]
-            ))
+        Args:
+            projects: Candidate projects, most likely first (deployments are
+                per resource, so projects sharing a resource are fetched once)
+            max_workers: Parallel lookups (capped at MAX_AZ_WORKERS)
+            limit: Most resources to prefetch
+        """
+        if not projects or limit <= 0:
+            return
         
-        return projects
+        self._resolve_shared_state()
+        
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, MAX_AZ_WORKERS)),
+                thread_name_prefix="deployments",
+            )
+        
+        for p in projects:
+            if len(self._prefetched) >= limit:
+                break
+            key = (p.resource_group, p.resource_name)
+            if key not in self._prefetched:
+                self._prefetched[key] = self._prefetch_executor.submit(
+                    self._fetch_deployments, p.resource_name, p.resource_group,
+                )
+    
+    def cancel_prefetch(self, keep: Optional[AzureProject] = None):
+        """
+        Drop queued prefetch lookups and release the prefetch threads.
+        
+        Without this the interpreter's exit hook would wait for every
+        queued ARM call.
+        
+        Args:
+            keep: Chosen project whose lookup should still complete
+        """
+        if self._prefetch_executor is None:
+            return
+        
+        keep_key = keep and (keep.resource_group, keep.resource_name)
+        for key in list(self._prefetched):
+            if key != keep_key:
+                self._prefetched.pop(key).cancel()
+        
+        # The kept lookup (if any) must still run, so only cancel the queue without it
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=keep is None)
+        self._prefetch_executor = None
     
     def list_deployments(self, resource_name: str, resource_group: str) -> list[ModelDeployment]:
         """
         List model deployments in a resource.
         
+        Uses a prefetched result (see prefetch_deployments) once; later
+        calls always fetch fresh, e.g. to refresh after a deploy.
+        
         Args:
             resource_name: Name of the CognitiveServices account
             resource_group: Resource group name
@@ -197,42 +407,100 @@ class AzureDiscovery:
         Returns:
             List of ModelDeployment objects
         """
-        result = self._run_az([
-            "cognitiveservices", "account", "deployment", "list",
-            "--name", resource_name,
-            "--resource-group", resource_group,
-            "--query", "[].{name:name, model:properties.model.name, version:properties.model.version}",
-            "-o", "json"
-        ], check=False)
-        
-        if result.returncode != 0:
+        future = self._prefetched.pop((resource_group, resource_name), None)
+        # A lookup still queued behind others is quicker to run directly
+        if future is not None and not future.cancel():
+            return future.result()
+        return self._fetch_deployments(resource_name, resource_group)
+    
+    def _fetch_deployments(self, resource_name: str, resource_group: str) -> list[ModelDeployment]:
+        """List model deployments in a resource (SDK or ARM REST)."""
+        if self._use_sdk:
+            from azure.mgmt.cognitiveservices import CognitiveServicesManagementClient
+            client = self._mgmt_client(CognitiveServicesManagementClient)
+            try:
+                deployments = []
+                for d in client.deployments.list(resource_group, resource_name):
+                    model = d.properties.model if d.properties else None
+                    deployments.append(ModelDeployment(
+                        deployment_name=d.name,
+                        model_name=(model and model.name) or "",
+                        version=(model and model.version) or ""
+                    ))
+                return deployments
+            except Exception:
+                return []
+        
+        try:
+            deployments_data = list_account_deployments(
+                get_credential(), self._get_subscription_id(), resource_group, resource_name,
+            )
+        except Exception:
             return []
         
-        deployments_data = json.loads(result.stdout or "[]")
         deployments = []
         
         for d in deployments_data:
+            model = d.get("properties", {}).get("model", {})
             deployments.append(ModelDeployment(
                 deployment_name=d["name"],
-                model_name=d["model"] or "",
-                version=d["version"] or ""
+                model_name=model.get("name") or "",
+                version=model.get("version") or ""
             ))
         
         return deployments
     
+    def list_deployments_bulk(
+        self,
+        resources: list[AzureResource],
+        max_workers: int = MAX_AZ_WORKERS,
+    ) -> dict[tuple[str, str], list[ModelDeployment]]:
+        """
+        List model deployments for several resources concurrently.
+        
+        Each ARM lookup is I/O bound, so running them on a thread pool brings
+        the total wait close to the slowest single call.
+        
+        Args:
+            resources: Resources to query
+            max_workers: Parallel lookups (capped at MAX_AZ_WORKERS)
+            
+        Returns:
+            Dict of (resource_group, resource_name) -> list of ModelDeployment
+        """
+        if not resources:
+            return {}
+        
+        self._resolve_shared_state()
+        
+        workers = max(1, min(max_workers, MAX_AZ_WORKERS, len(resources)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda r: self.list_deployments(r.name, r.resource_group),
+                resources,
+            )
+            return {
+                (r.resource_group, r.name): deployments
+                for r, deployments in zip(resources, results)
+            }
+    
     def get_api_key(self, resource_name: str, resource_group: str) -> Optional[str]:
         """Get API key for a resource."""
-        result = self._run_az([
-            "cognitiveservices", "account", "keys", "list",
-            "-n", resource_name,
-            "-g", resource_group,
-            "--query", "key1",
-            "-o", "tsv"
-        ], check=False)
+        if self._use_sdk:
+            from azure.mgmt.cognitiveservices import CognitiveServicesManagementClient
+            client = self._mgmt_client(CognitiveServicesManagementClient)
+            try:
+                return client.accounts.list_keys(resource_group, resource_name).key1
+            except Exception:
+                return None
         
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return None
+        # ARM listKeys directly - `az cognitiveservices account keys list`
+        # would load the whole cognitiveservices command module first
+        try:
+            keys = list_account_keys(get_credential(), self._get_subscription_id(), resource_group, resource_name)
+        except Exception:
+            return None
+        return keys.get("key1")
 
 
 def select_from_list(items: list, prompt: str, display_fn=str) -> Optional[int]:
@@ -250,10 +518,10 @@ def select_from_list(items: list, prompt: str, display_fn=str) -> Optional[int]:
     if not items:
         return None
     
-    print()
-    for i, item in enumerate(items, 1):
-        print(f"  [{i:2d}] {display_fn(item)}")
-    print()
+    # Build the whole menu and write it in one go
+    lines = [f"  [{i:2d}] {display_fn(item)}\n" for i, item in enumerate(items, 1)]
+    sys.stdout.write("\n" + "".join(lines) + "\n")
+    sys.stdout.flush()
     
     if len(items) == 1:
         print("Auto-selecting the only option...")
@@ -11,16 +11,31 @@ model: gpt-4o-mini
 You are a helpful assistant. When invoked...
 """
 
+import json
+import os
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from typing import Optional
 from pathlib import Path
 
-try:
-    import yaml
-except ImportError:
-    print("PyYAML not installed. Run: pip install pyyaml")
-    raise
+
+# Frontmatter keys the flat scanner accepts; anything else goes through PyYAML
+_FLAT_KEY_RE = re.compile(r'[A-Za-z_][\w.-]*')
+
+# Plain scalars PyYAML would resolve to bool/null/number/date rather than str
+_NON_STRING_SCALAR_RE = re.compile(
+    r'~|null|true|false|yes|no|on|off|[-+]?\.?\d.*|[-+]?\.(?:inf|nan)',
+    re.IGNORECASE,
+)
+
+# In-process memo of parsed files, keyed by (resolved path, mtime_ns, size)
+_PARSE_CACHE: dict[tuple[str, int, int], "AgentConfig"] = {}
+
+# Leading characters that start YAML block, flow, anchor, tag or comment syntax
+_YAML_INDICATORS = '-?:,[]{}#&*!|>%@`'
+
+# PyYAML module and loader class, resolved on first full YAML parse
+_YAML: Optional[tuple[object, type]] = None
 
 
 @dataclass
@@ -38,47 +53,147 @@ Model: {self.model_hint or 'default'}
 Instructions: {self.instructions[:100]}..."""
 
 
-def parse_agent_yaml(file_path: str | Path) -> AgentConfig:
+def _parse_flat_frontmatter(frontmatter_str: str) -> Optional[dict]:
     """
-    Parse an agent YAML file with frontmatter.
+    Parse flat `key: value` frontmatter without invoking PyYAML.
     
-    Format:
-        ---
-        name: agent-name
-        description: What the agent does
-        model: gpt-4o-mini   # optional
-        ---
-        
-        Instructions content here...
+    Agent definitions only use a handful of string fields, so the common
+    case never needs a full YAML loader.
     
     Args:
-        file_path: Path to the YAML file
+        frontmatter_str: Text between the --- markers
         
     Returns:
-        AgentConfig with parsed values
+        Dict of string values, or None if the frontmatter uses any YAML
+        syntax beyond flat string pairs (caller should fall back to PyYAML)
     """
-    file_path = Path(file_path)
+    result = {}
     
-    if not file_path.exists():
-        raise FileNotFoundError(f"Agent file not found: {file_path}")
+    for line in frontmatter_str.split("\n"):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        
+        # Indentation means nesting or a continued scalar; tabs are left
+        # to PyYAML, which treats them differently from spaces
+        if line[0].isspace() or "\t" in line:
+            return None
+        
+        # Only `key: value` - "key:value" is a plain scalar to YAML, not a pair
+        key, sep, value = stripped.partition(":")
+        if not sep or not value.startswith(" ") or not _FLAT_KEY_RE.fullmatch(key):
+            return None
+        
+        value = value.strip()
+        if not value or value[0] in _YAML_INDICATORS:
+            return None
+        
+        if value[0] in "\"'":
+            quote = value[0]
+            if len(value) < 2 or value[-1] != quote or quote in value[1:-1] or "\\" in value:
+                return None
+            value = value[1:-1]
+        else:
+            # Drop trailing comment (e.g. "gpt-4o-mini   # optional")
+            value = value.split(" #", 1)[0].rstrip()
+            if ": " in value or value.endswith(":") or _NON_STRING_SCALAR_RE.fullmatch(value):
+                return None
+        
+        result[key] = value
     
-    content = file_path.read_text()
+    return result
+
+
+def _get_yaml() -> tuple[object, type]:
+    """Import PyYAML once and pick its fastest safe loader."""
+    global _YAML
+    if _YAML is None:
+        try:
+            import yaml
+        except ImportError:
+            print("PyYAML not installed. Run: pip install pyyaml")
+            raise
+        
+        # Prefer libyaml's C loader; the pure-Python one is several times slower
+        if getattr(yaml, "__with_libyaml__", False):
+            loader = yaml.CSafeLoader
+        else:
+            loader = yaml.SafeLoader
+            print("💡 PyYAML was built without libyaml (slower YAML parsing). To fix:")
+            print("   pip install --force-reinstall --no-binary pyyaml pyyaml  # needs libyaml headers")
+        _YAML = (yaml, loader)
+    return _YAML
+
+
+def _load_yaml(frontmatter: str | bytes):
+    """Load frontmatter with PyYAML, importing it only when needed."""
+    yaml, loader = _get_yaml()
+    try:
+        return yaml.load(frontmatter, Loader=loader)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in frontmatter: {e}")
+
+
+def _cache_path(file_path: Path) -> Path:
+    """Sidecar JSON cache location for a parsed agent file."""
+    return file_path.with_name(file_path.name + ".cache.json")
+
+
+def _read_cache(cache_path: Path, cache_key: str) -> Optional[AgentConfig]:
+    """Return the cached AgentConfig if the sidecar matches cache_key."""
+    try:
+        key_line, _, payload = cache_path.read_text().partition("\n")
+        if key_line != cache_key:
+            return None
+        return AgentConfig(**json.loads(payload))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(cache_path: Path, cache_key: str, config: AgentConfig):
+    """Atomically write the sidecar cache; failures are non-fatal."""
+    try:
+        payload = json.dumps(asdict(config))
+    except (TypeError, ValueError):
+        # PyYAML may yield non-JSON values (e.g. a date description) - don't cache
+        return
     
-    # Parse frontmatter (content between --- markers)
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n?(.*)'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        temp_path.write_text(cache_key + "\n" + payload)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Read-only directory etc. - just skip caching
+        temp_path.unlink(missing_ok=True)
+
+
+def _parse_content(content: str | bytes, source: str = "<string>") -> AgentConfig:
+    """
+    Parse agent definition content (frontmatter + instructions).
     
-    if not match:
-        raise ValueError(f"Invalid agent file format. Expected YAML frontmatter between --- markers.")
+    Args:
+        content: Raw file content; bytes are only decoded where needed
+        source: Where the content came from, for error messages
+        
+    Returns:
+        AgentConfig with parsed values
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
     
-    frontmatter_str = match.group(1)
-    instructions = match.group(2).strip()
+    # Split frontmatter (content between --- markers) with a direct scan
+    start = content.find(b"\n") + 1
+    end = content.find(b"\n---", start - 1)
+    if not content.startswith(b"---") or start == 0 or content[3:start].strip() or end < start:
+        raise ValueError(f"Invalid agent file format in {source}. Expected YAML frontmatter between --- markers.")
     
-    # Parse YAML frontmatter
-    try:
-        frontmatter = yaml.safe_load(frontmatter_str)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in frontmatter: {e}")
+    frontmatter_bytes = content[start:end]
+    instructions = content[end + 4:].decode("utf-8").replace("\r\n", "\n").strip()
+    
+    # Parse frontmatter, falling back to PyYAML for anything non-trivial
+    frontmatter = _parse_flat_frontmatter(frontmatter_bytes.decode("utf-8"))
+    if frontmatter is None:
+        frontmatter = _load_yaml(frontmatter_bytes)
     
     if not isinstance(frontmatter, dict):
         raise ValueError("Frontmatter must be a YAML dictionary")
@@ -99,6 +214,55 @@ def parse_agent_yaml(file_path: str | Path) -> AgentConfig:
     )
 
 
+def parse_agent_yaml(file_path: str | Path) -> AgentConfig:
+    """
+    Parse an agent YAML file with frontmatter.
+    
+    Format:
+        ---
+        name: agent-name
+        description: What the agent does
+        model: gpt-4o-mini   # optional
+        ---
+        
+        Instructions content here...
+    
+    The parsed result is memoized in-process and cached in a
+    `<file>.cache.json` sidecar, both keyed by the source file's mtime and
+    size, so unchanged files skip parsing.
+    
+    Args:
+        file_path: Path to the YAML file
+        
+    Returns:
+        AgentConfig with parsed values
+    """
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        raise FileNotFoundError(f"Agent file not found: {file_path}")
+    
+    stat = file_path.stat()
+    memo_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    # Hand out copies so a caller changing its config can't alter the memo
+    if memo_key in _PARSE_CACHE:
+        return replace(_PARSE_CACHE[memo_key])
+    
+    cache_key = f"{stat.st_mtime_ns}-{stat.st_size}"
+    cache_path = _cache_path(file_path)
+    config = _read_cache(cache_path, cache_key)
+    if config is None:
+        config = _parse_content(file_path.read_bytes(), str(file_path))
+        _write_cache(cache_path, cache_key, config)
+    
+    _PARSE_CACHE[memo_key] = config
+    return replace(config)
+
+
+# Allow callers (and tests) to drop the in-process memo
+parse_agent_yaml.cache_clear = _PARSE_CACHE.clear
+
+
 def parse_agent_string(content: str) -> AgentConfig:
     """
     Parse agent definition from a string.
@@ -109,16 +273,7 @@ def parse_agent_string(content: str) -> AgentConfig:
     Returns:
         AgentConfig with parsed values
     """
-    # Write to temp and parse
-    import tempfile
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write(content)
-        temp_path = f.name
-    
-    try:
-        return parse_agent_yaml(temp_path)
-    finally:
-        Path(temp_path).unlink()
+    return _parse_content(content)
 
 
 if __name__ == "__main__":
@@ -8,21 +8,31 @@ Usage:
 """
 
 import argparse
+import asyncio
+import importlib.util
 import json
+import re
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 # Add agents module to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Check dependencies before importing
-try:
-    import yaml
-    from azure.ai.projects import AIProjectClient
-    from azure.identity import DefaultAzureCredential
-except ImportError as e:
-    print(f"\n❌ Missing required Python dependencies: {e}")
+# Check dependencies before importing - find_spec only locates the modules,
+# so the slow Azure SDK imports wait until they're actually used
+def _is_installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        # Parent package (e.g. azure.ai) missing
+        return False
+
+
+_missing = [m for m in ("httpx", "yaml", "azure.ai.projects", "azure.identity") if not _is_installed(m)]
+if _missing:
+    print(f"\n❌ Missing required Python dependencies: {', '.join(_missing)}")
     print("\n   Install with:")
     print("   pip install azure-ai-projects==2.0.0b3 azure-identity PyYAML openai")
     print("\n   Or if you have requirements.txt:")
@@ -30,83 +40,182 @@ except ImportError as e:
     sys.exit(1)
 
 from agents.yaml_parser import parse_agent_yaml, AgentConfig
-from agents.azure_discovery import AzureDiscovery, AzureProject, ModelDeployment, select_from_list
-from agents.agent_builder import AgentBuilder
+from agents.azure_discovery import (
+    AZ_ENV, AZ_INTERACTIVE_ENV, AzureDiscovery, AzureProject, ModelDeployment, select_from_list,
+)
+from agents.agent_builder import AgentBuilder, get_credential
+from agents.az_api import (
+    KNOWN_ROLE_IDS, azure_profile_path, get_role_name, get_signed_in_user, get_subscription,
+    iter_role_assignments, list_quota_usage,
+)
 
 
 # Roles that grant sufficient access for Azure AI Foundry
-SUFFICIENT_ROLES = {
+SUFFICIENT_ROLES = frozenset({
     "Owner", "Contributor",
     "Azure AI User", "Azure AI Owner", 
     "Azure AI Account Owner", "Azure AI Project Manager"
-}
+})
+
+
+# Role-definition GUIDs (identical in every tenant) of sufficient built-in
+# roles, recognised without resolving role names
+SUFFICIENT_ROLE_IDS = frozenset(
+    role_id for role_id, name in KNOWN_ROLE_IDS.items() if name in SUFFICIENT_ROLES
+)
+
+
+# Quota entries that never back a chat deployment
+_QUOTA_EXCLUDE = re.compile(r"finetune|batch|realtime|audio|transcribe|tts|diarize")
+
+
+# Prerequisite lookups cached between runs (seconds)
+CACHE_DIR = Path.home() / ".cache" / "azure-ai-agent-deploy"
+ACCOUNT_CACHE_TTL = 2 * 60 * 60
+USER_CACHE_TTL = 12 * 60 * 60
+ROLES_CACHE_TTL = 15 * 60
+
+
+def _read_cache(key: str, ttl_sec: int):
+    """Return the cached JSON value for key if younger than ttl_sec, else None."""
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime < ttl_sec:
+            return json.loads(path.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_cache(key: str, value):
+    """Store a JSON value under CACHE_DIR (best-effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"{key}.json").write_text(json.dumps(value))
+    except OSError:
+        pass
+
+
+def _login_cache_key(name: str) -> str:
+    """
+    Cache key for a lookup that depends on who is logged in.
+    
+    az rewrites its profile file on login, logout and `az account set`, so
+    keying on the file's modification time drops cached identity and
+    subscription details as soon as any of them may have changed.
+    """
+    try:
+        stamp = azure_profile_path().stat().st_mtime_ns
+    except OSError:
+        stamp = 0
+    return f"{name}-{stamp}"
+
+
+def _cached_json(key: str, ttl_sec: int, producer, refresh: bool = False) -> tuple[object, bool]:
+    """
+    Return producer() result, reusing a JSON copy under CACHE_DIR for ttl_sec.
+    
+    Args:
+        key: Cache file name (without .json)
+        ttl_sec: Maximum age of a cached value
+        producer: Callable computing the value; None results are not cached
+        refresh: Ignore any cached value
+        
+    Returns:
+        (value, from_cache)
+    """
+    if not refresh:
+        value = _read_cache(key, ttl_sec)
+        if value is not None:
+            return value, True
+    
+    value = producer()
+    if value is not None:
+        _write_cache(key, value)
+    return value, False
+
+
+def clear_cache():
+    """Delete all cached prerequisite lookups."""
+    for path in CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
 
 
-def check_azure_roles() -> bool:
+def check_azure_roles(account: dict) -> bool:
     """
     Check if the current user has sufficient Azure roles for AI Foundry.
-    Assumes check_azure_cli() has already verified az CLI and login.
+    
+    Uses agents.az_api with the shared DefaultAzureCredential: the ARM
+    token's claims identify the user, and a single role-assignments REST
+    call replaces the az identity/role lookups. Both results are cached
+    under CACHE_DIR (see --refresh-cache).
+    
+    Args:
+        account: Subscription info from check_azure_cli()
     
     Returns:
         True if roles are sufficient, False otherwise (after printing help).
     """
     print_header("Checking Azure Roles")
     
-    # Get account info (already verified logged in by check_azure_cli)
-    result = subprocess.run(
-        ["az", "account", "show"],
-        capture_output=True, text=True
-    )
-    account = json.loads(result.stdout)
     subscription_id = account.get("id")
     subscription_name = account.get("name")
     
-    # Get current user ID
-    result = subprocess.run(
-        ["az", "ad", "signed-in-user", "show", "--query", "id", "-o", "tsv"],
-        capture_output=True, text=True
-    )
-    if result.returncode != 0:
+    # Get current user from the ARM token claims
+    credential = get_credential()
+    user, _ = _get_signed_in_user(credential)
+    if not user:
         # Might be a service principal, skip role check
         print("\n⚠️  Could not determine user identity (may be service principal).")
         print("   Proceeding anyway...")
         return True
     
-    user_id = result.stdout.strip()
-    
-    # Get user principal name for display
-    result = subprocess.run(
-        ["az", "ad", "signed-in-user", "show", "--query", "userPrincipalName", "-o", "tsv"],
-        capture_output=True, text=True
-    )
-    user_name = result.stdout.strip() if result.returncode == 0 else user_id
+    user_id = user["id"]
+    user_name = user["upn"]
     
     print(f"\n   User: {user_name}")
     print(f"   Subscription: {subscription_name}")
     
     # Get subscription-level role assignments
     sub_scope = f"/subscriptions/{subscription_id}"
-    result = subprocess.run(
-        ["az", "role", "assignment", "list", 
-         "--assignee", user_id, 
-         "--scope", sub_scope,
-         "--query", f"[?scope=='{sub_scope}'].roleDefinitionName",
-         "-o", "json"],
-        capture_output=True, text=True
-    )
+    cache_key = f"roles-{subscription_id}-{user_id}"
     
-    roles = []
-    if result.returncode == 0 and result.stdout.strip():
+    def list_roles() -> list[str] | None:
+        # Only direct subscription-scope assignments count; None = lookup failed.
+        # Stop at the first sufficient role - it's all the check needs.
+        roles = []
+        unresolved = []
         try:
-            roles = json.loads(result.stdout)
-        except json.JSONDecodeError:
-            roles = []
+            for assignment in iter_role_assignments(credential, subscription_id, user_id, resolve_names=False):
+                if assignment["scope"].lower() != sub_scope.lower():
+                    continue
+                role_definition_id = assignment["role_definition_id"]
+                if role_definition_id.rsplit("/", 1)[-1] in SUFFICIENT_ROLE_IDS:
+                    return [assignment["role_name"]]
+                unresolved.append(role_definition_id)
+            
+            # Other roles (e.g. Azure AI Owner) are matched by name
+            for role_definition_id in unresolved:
+                role_name = get_role_name(credential, role_definition_id)
+                if role_name:
+                    roles.append(role_name)
+                    if role_name in SUFFICIENT_ROLES:
+                        break
+        except Exception:
+            return None
+        return roles
+    
+    roles, roles_cached = _cached_json(cache_key, ROLES_CACHE_TTL, list_roles)
+    if roles_cached and not set(roles) & SUFFICIENT_ROLES:
+        # A missing role is exactly what users fix between runs - don't trust a cached failure
+        roles, roles_cached = _cached_json(cache_key, ROLES_CACHE_TTL, list_roles, refresh=True)
+    roles = roles or []
     
     # Check for sufficient roles
     found_roles = set(roles) & SUFFICIENT_ROLES
     
     if found_roles:
-        print(f"\n   ✅ Roles: {', '.join(found_roles)}")
+        print(f"\n   ✅ Roles: {', '.join(found_roles)}{' (cached)' if roles_cached else ''}")
         return True
     
     # No sufficient roles found
@@ -125,21 +234,80 @@ def check_azure_roles() -> bool:
     return False
 
 
-def check_azure_cli() -> bool:
+async def _az_async(args: list[str]) -> subprocess.CompletedProcess:
+    """Async counterpart of _az (raises FileNotFoundError if az is missing)."""
+    proc = await asyncio.create_subprocess_exec(
+        "az", *args,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=AZ_ENV,
+    )
+    stdout, stderr = await proc.communicate()
+    return subprocess.CompletedProcess(["az", *args], proc.returncode, stdout.decode(), stderr.decode())
+
+
+async def _probe_prerequisites(account_cached: bool) -> list:
+    """
+    Run the independent prerequisite probes concurrently.
+    
+    Returns:
+        [az --version result, subscription (None if account_cached),
+        (signed-in user, from_cache)] - failures are returned as exceptions
+    """
+    credential = get_credential()
+    return await asyncio.gather(
+        _az_async(["--version"]),
+        asyncio.sleep(0) if account_cached else asyncio.to_thread(get_subscription, credential),
+        asyncio.to_thread(_get_signed_in_user, credential),
+        return_exceptions=True,
+    )
+
+
+def _get_signed_in_user(credential) -> tuple[dict | None, bool]:
+    """Signed-in user from the ARM token claims, cached under CACHE_DIR."""
+    def signed_in_user() -> dict | None:
+        return get_signed_in_user(credential)
+    
+    return _cached_json(_login_cache_key("signed-in-user"), USER_CACHE_TTL, signed_in_user)
+
+
+def preflight() -> dict | None:
+    """
+    Run all prerequisite checks: Azure CLI, login and Azure roles.
+    
+    Returns:
+        Current subscription info if every check passed, None otherwise
+        (after printing help).
+    """
+    account = check_azure_cli()
+    if not account or not check_azure_roles(account):
+        return None
+    return account
+
+
+def check_azure_cli() -> dict | None:
     """
     Check if Azure CLI is installed and user is logged in.
     
+    The login check asks the shared credential for an ARM token and reads
+    the default subscription over REST (agents.az_api) rather than running
+    `az account show`. It runs concurrently with the `az --version` probe
+    and the signed-in user lookup used by check_azure_roles().
+    
     Returns:
-        True if az CLI is ready, False otherwise (after printing help).
+        Current subscription info ({"id", "name"}) if az CLI is ready,
+        None otherwise (after printing help).
     """
     print_header("Prerequisites Check")
     
+    # Version, login and identity checks are independent - run them together
+    account_key = _login_cache_key("account")
+    account = _read_cache(account_key, ACCOUNT_CACHE_TTL)
+    account_cached = account is not None
+    result, fetched_account, _ = asyncio.run(_probe_prerequisites(account_cached))
+    
     # Check if az CLI is available
     try:
-        result = subprocess.run(
-            ["az", "--version"],
-            capture_output=True, text=True
-        )
+        if isinstance(result, Exception):
+            raise result
         if result.returncode != 0:
             raise FileNotFoundError()
         
@@ -159,26 +327,25 @@ def check_azure_cli() -> bool:
         print("   Linux:   curl -sL https://aka.ms/InstallAzureCLIDeb | sudo bash")
         print()
         print("   Or visit: https://docs.microsoft.com/en-us/cli/azure/install-azure-cli")
-        return False
+        return None
     
     # Check if logged in
-    result = subprocess.run(
-        ["az", "account", "show"],
-        capture_output=True, text=True
-    )
-    if result.returncode != 0:
+    if not account_cached and isinstance(fetched_account, dict):
+        account = fetched_account
+        _write_cache(account_key, account)
+    
+    if not account:
         print("\n❌ Not logged into Azure CLI.")
         print()
         print("   Run one of these commands to login:")
         print("   ─" * 30)
         print("   az login                    # Browser-based login")
         print("   az login --use-device-code  # Device code login (for remote/SSH)")
-        return False
+        return None
     
-    account = json.loads(result.stdout)
-    print(f"   ✅ Logged in to subscription: {account.get('name')}")
+    print(f"   ✅ Logged in to subscription: {account.get('name')}{' (cached)' if account_cached else ''}")
     
-    return True
+    return account
 
 
 def print_header(text: str):
@@ -203,22 +370,31 @@ def select_project(discovery: AzureDiscovery, filter_term: str = "") -> AzurePro
     print_header("Select Azure AI Project")
     
     print(f"\nSearching for projects{f' matching \"{filter_term}\"' if filter_term else ''}...")
-    projects = discovery.list_projects(filter_term)
+    try:
+        projects = discovery.list_projects(filter_term)
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
     
     if not projects:
         print("No projects found.")
         print("\nTip: Create a project with: ./setup-azure-ai.sh myproject swedencentral")
         sys.exit(1)
     
+    # Look up deployments while the user reads the menu
+    discovery.prefetch_deployments(projects)
+    
     def display_project(p: AzureProject) -> str:
         return f"{p.resource_name}/{p.name:<25} {p.location}"
     
     idx = select_from_list(projects, "Select project", display_project)
     
     if idx is None:
+        discovery.cancel_prefetch()
         print("No project selected.")
         sys.exit(1)
     
+    discovery.cancel_prefetch(keep=projects[idx])
     return projects[idx]
 
 
@@ -234,30 +410,26 @@ def _check_model_quota(location: str, model_name: str) -> tuple[bool, str]:
         (has_quota, message) - tuple of availability and status message
     """
     try:
-        # Get quota usage for the location
-        result = subprocess.run(
-            ["az", "cognitiveservices", "usage", "list",
-             "--location", location,
-             "-o", "json"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode != 0:
+        # Get quota usage for the location (ARM REST, no az process)
+        credential = get_credential()
+        account = get_subscription(credential)
+        if not account:
             return True, "(quota check unavailable)"  # Proceed anyway
         
-        usages = json.loads(result.stdout) if result.stdout.strip() else []
+        usages = list_quota_usage(credential, account["id"], location)
         
         # Look for matching quota entries (Standard or GlobalStandard)
-        model_lower = model_name.lower()
+        # ("globalstandard" contains "standard", so one lookahead covers both)
+        is_match = re.compile(rf"(?=.*standard).*{re.escape(model_name.lower())}").match
         for usage in usages:
             name = usage.get("name", {}).get("value", "").lower()
             
             # Skip non-relevant quota types
-            if any(x in name for x in ["finetune", "batch", "realtime", "audio", "transcribe", "tts", "diarize"]):
+            if _QUOTA_EXCLUDE.search(name):
                 continue
             
             # Check if this is a matching model with Standard/GlobalStandard
-            if model_lower in name and ("standard" in name or "globalstandard" in name):
+            if is_match(name):
                 current = int(usage.get("currentValue", 0))
                 limit = int(usage.get("limit", 0))
                 available = limit - current
@@ -299,6 +471,7 @@ def _deploy_model(resource_name: str, model_filter: str) -> bool:
         result = subprocess.run(
             [str(script_path), resource_name, model_filter],
             cwd=Path(__file__).parent,
+            env=AZ_INTERACTIVE_ENV,
         )
         return result.returncode == 0
     except Exception as e:
@@ -306,6 +479,70 @@ def _deploy_model(resource_name: str, model_filter: str) -> bool:
         return False
 
 
+def _match_deployments(deployments: list[ModelDeployment], hint_lower: str) -> tuple[list[ModelDeployment], list[ModelDeployment]]:
+    """
+    Match deployments against a lowercase model hint.
+    
+    Names are lowercased once per deployment and both match kinds are
+    collected from that single index.
+    
+    Returns:
+        (exact, partial) - exact deployment/model name matches, and
+        substring matches (a superset of exact)
+    """
+    index = [(d, d.deployment_name.lower(), d.model_name.lower()) for d in deployments]
+    exact = [d for d, dn, mn in index if hint_lower in (dn, mn)]
+    partial = [d for d, dn, mn in index if hint_lower in dn or hint_lower in mn]
+    return exact, partial
+
+
+def _try_deploy_and_find(discovery: AzureDiscovery, project: AzureProject, model_hint: str,
+                         action: str = "now", exact_only: bool = False
+                         ) -> tuple[ModelDeployment | None, list[ModelDeployment] | None]:
+    """
+    Offer to deploy model_hint into the project's resource and return it.
+    
+    Checks quota, asks for confirmation, runs the deploy script, then
+    re-lists deployments once and matches the hint (exact first, then
+    substring unless exact_only).
+    
+    Args:
+        discovery: AzureDiscovery used to re-list deployments
+        project: Project whose resource receives the deployment
+        model_hint: Model name to deploy (e.g., 'gpt-4o')
+        action: Wording for the prompt ("now" or "instead")
+        exact_only: Only accept an exact match - set after the user declined
+            a partial match, so it isn't picked as "newly deployed"
+        
+    Returns:
+        (deployment, refreshed deployments) - deployment is None if quota
+        is missing, the user declined, the deploy failed or nothing
+        matched; the list is None unless deployments were re-listed.
+    """
+    has_quota, quota_msg = _check_model_quota(project.location, model_hint)
+    if not has_quota:
+        print(f"\n   ❌ Cannot deploy '{model_hint}': {quota_msg}")
+        print(f"      Try a different region or request quota increase.")
+        return None, None
+    
+    print(f"\n   📊 Quota for '{model_hint}' in {project.location}: {quota_msg}")
+    response = input(f"\nDeploy '{model_hint}' {action}? (Y/n): ").strip().lower()
+    if response == 'n' or not _deploy_model(project.resource_name, model_hint):
+        return None, None
+    
+    # Refresh deployments after successful deploy
+    print("\nRefreshing deployments...")
+    deployments = discovery.list_deployments(project.resource_name, project.resource_group)
+    exact_matches, partial_matches = _match_deployments(deployments, model_hint.lower())
+    matches = exact_matches if exact_only else exact_matches or partial_matches
+    if not matches:
+        print(f"No deployment matching '{model_hint}' found after deploy attempt.")
+        return None, deployments
+    
+    print(f"\nUsing newly deployed: {matches[0].deployment_name}")
+    return matches[0], deployments
+
+
 def select_deployment(discovery: AzureDiscovery, project: AzureProject, model_hint: str = "") -> ModelDeployment:
     """Let user select a deployed model."""
     print_header("Select Model Deployment")
@@ -316,108 +553,47 @@ def select_deployment(discovery: AzureDiscovery, project: AzureProject, model_hi
     if not deployments:
         print("No model deployments found.")
         print(f"\nTip: Deploy a model with: ./deploy-azure-model.sh {project.resource_name}")
-        if model_hint:
-            # Check quota before offering to deploy
-            has_quota, quota_msg = _check_model_quota(project.location, model_hint)
-            if has_quota:
-                print(f"\n   📊 Quota for '{model_hint}' in {project.location}: {quota_msg}")
-                response = input(f"\nDeploy '{model_hint}' now? (Y/n): ").strip().lower()
-                if response != 'n':
-                    if _deploy_model(project.resource_name, model_hint):
-                        # Refresh deployments after successful deploy
-                        print("\nRefreshing deployments...")
-                        deployments = discovery.list_deployments(project.resource_name, project.resource_group)
-                        if not deployments:
-                            print("Still no deployments found after deploy attempt.")
-                            sys.exit(1)
-                    else:
-                        sys.exit(1)
-            else:
-                print(f"\n   ❌ Cannot deploy '{model_hint}': {quota_msg}")
-                print(f"      Try a different region or request quota increase.")
-                sys.exit(1)
-        else:
+        d, refreshed = _try_deploy_and_find(discovery, project, model_hint) if model_hint else (None, None)
+        if d:
+            return d
+        if not refreshed:
             sys.exit(1)
-    
-    # If model hint provided, try to find matching deployment
-    if model_hint:
+        # A deployment showed up that didn't match the hint - offer the list
+        deployments = refreshed
+    elif model_hint:
+        # Model hint provided - try to find a matching deployment
         hint_lower = model_hint.lower()
+        exact_matches, partial_matches = _match_deployments(deployments, hint_lower)
         
-        # First pass: exact match on deployment name or model name
-        for d in deployments:
-            if hint_lower == d.deployment_name.lower() or hint_lower == d.model_name.lower():
-                print(f"\nAuto-selecting deployment matching '{model_hint}': {d.deployment_name}")
-                return d
-        
-        # Second pass: substring match (but ask for confirmation)
-        partial_matches = []
-        for d in deployments:
-            if hint_lower in d.deployment_name.lower() or hint_lower in d.model_name.lower():
-                partial_matches.append(d)
+        # Exact match on deployment name or model name
+        if exact_matches:
+            d = exact_matches[0]
+            print(f"\nAuto-selecting deployment matching '{model_hint}': {d.deployment_name}")
+            return d
         
+        # Substring match (but ask for confirmation)
         if len(partial_matches) == 1:
             d = partial_matches[0]
             print(f"\nNo exact match for '{model_hint}', closest: {d.deployment_name}")
             response = input(f"Use '{d.deployment_name}'? (Y/n): ").strip().lower()
             if response != 'n':
                 return d
-            # User declined partial match - check quota before offering to deploy
-            has_quota, quota_msg = _check_model_quota(project.location, model_hint)
-            if has_quota:
-                print(f"\n   📊 Quota for '{model_hint}' in {project.location}: {quota_msg}")
-                response = input(f"Deploy '{model_hint}' instead? (Y/n): ").strip().lower()
-                if response != 'n':
-                    if _deploy_model(project.resource_name, model_hint):
-                        print("\nRefreshing deployments...")
-                        deployments = discovery.list_deployments(project.resource_name, project.resource_group)
-                        for d in deployments:
-                            if hint_lower == d.deployment_name.lower() or hint_lower == d.model_name.lower():
-                                print(f"\nUsing newly deployed: {d.deployment_name}")
-                                return d
-            else:
-                print(f"\n   ❌ Cannot deploy '{model_hint}': {quota_msg}")
+            # User declined partial match - offer to deploy the hinted model
+            d, refreshed = _try_deploy_and_find(discovery, project, model_hint, "instead", exact_only=True)
         elif partial_matches:
             print(f"\nNo exact match for '{model_hint}'. Partial matches found:")
             for d in partial_matches:
                 print(f"  - {d.deployment_name}")
-            # Check quota before offering to deploy
-            has_quota, quota_msg = _check_model_quota(project.location, model_hint)
-            if has_quota:
-                print(f"\n   📊 Quota for '{model_hint}' in {project.location}: {quota_msg}")
-                response = input(f"\nDeploy '{model_hint}' instead? (Y/n): ").strip().lower()
-                if response != 'n':
-                    if _deploy_model(project.resource_name, model_hint):
-                        print("\nRefreshing deployments...")
-                        deployments = discovery.list_deployments(project.resource_name, project.resource_group)
-                        for d in deployments:
-                            if hint_lower == d.deployment_name.lower() or hint_lower == d.model_name.lower():
-                                print(f"\nUsing newly deployed: {d.deployment_name}")
-                                return d
-            else:
-                print(f"\n   ❌ Cannot deploy '{model_hint}': {quota_msg}")
-        
-        # No matches at all - check quota before offering to deploy
-        if not partial_matches:
+            d, refreshed = _try_deploy_and_find(discovery, project, model_hint, "instead", exact_only=True)
+        else:
             print(f"\nNo deployment found matching '{model_hint}'.")
-            has_quota, quota_msg = _check_model_quota(project.location, model_hint)
-            if has_quota:
-                print(f"   📊 Quota for '{model_hint}' in {project.location}: {quota_msg}")
-                response = input(f"\nDeploy '{model_hint}' now? (Y/n): ").strip().lower()
-                if response != 'n':
-                    if _deploy_model(project.resource_name, model_hint):
-                        # Refresh deployments after successful deploy
-                        print("\nRefreshing deployments...")
-                        deployments = discovery.list_deployments(project.resource_name, project.resource_group)
-                        # Try to find the newly deployed model
-                        for d in deployments:
-                            if hint_lower == d.deployment_name.lower() or hint_lower == d.model_name.lower():
-                                print(f"\nUsing newly deployed: {d.deployment_name}")
-                                return d
-                            if hint_lower in d.deployment_name.lower() or hint_lower in d.model_name.lower():
-                                print(f"\nUsing newly deployed: {d.deployment_name}")
-                                return d
-            else:
-                print(f"   ❌ Cannot deploy '{model_hint}': {quota_msg}")
+            d, refreshed = _try_deploy_and_find(discovery, project, model_hint)
+        
+        if d:
+            return d
+        # Offer the re-listed deployments (including a new one that didn't match)
+        if refreshed:
+            deployments = refreshed
     
     def display_deployment(d: ModelDeployment) -> str:
         return f"{d.deployment_name:<25} ({d.model_name} {d.version})"
@@ -440,8 +616,8 @@ def create_agent_interactive(yaml_path: str, filter_term: str = "", test: bool =
         filter_term: Optional filter for resources/projects
         test: Whether to test the agent after creation
     """
-    # Check Azure CLI is installed and user is logged in
-    if not check_azure_cli():
+    # Check Azure CLI is installed, user is logged in and has the needed roles
+    if not preflight():
         sys.exit(1)
     
     # Parse YAML
@@ -455,10 +631,6 @@ def create_agent_interactive(yaml_path: str, filter_term: str = "", test: bool =
         print(f"\nError parsing YAML: {e}")
         sys.exit(1)
     
-    # Check Azure roles before proceeding
-    if not check_azure_roles():
-        sys.exit(1)
-    
     # Initialize Azure discovery
     print_header("Azure Authentication")
     
@@ -608,8 +780,17 @@ YAML Format:
         help="Test the agent after creation"
     )
     
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached Azure account/user/role lookups"
+    )
+    
     args = parser.parse_args()
     
+    if args.refresh_cache:
+        clear_cache()
+    
     # Check file exists
     if not Path(args.yaml_file).exists():
         print(f"Error: File not found: {args.yaml_file}")
@@ -4,30 +4,32 @@ Simple Fake Pirate Agent - A prompt-based agent that talks like a pirate.
 
 This creates a simple agent using Azure AI Projects SDK with just a system prompt.
 No container image required - pure prompt-based pirate personality!
+The Azure SDK is imported on first use, so usage/help output is instant.
 
 Prerequisites:
 - Set AZURE_AI_PROJECT_ENDPOINT environment variable
 - Have proper Azure credentials configured (DefaultAzureCredential)
 """
 
+import argparse
+import itertools
 import os
 import sys
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import AgentDefinition, AgentKind
-from azure.core.exceptions import ResourceExistsError
+from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def create_fake_pirate_agent():
-    """Create a simple prompt-based pirate agent."""
-    
-    client = AIProjectClient(
-        endpoint=os.environ["AZURE_AI_PROJECT_ENDPOINT"],
-        credential=DefaultAzureCredential()
-    )
-    
-    # System prompt that makes the agent talk like a pirate
-    pirate_system_prompt = """Ahoy, matey! Ye be talkin' to Captain Fake-Beard, the fiercest pirate on the seven seas!
+from agents.agent_builder import get_project_client
+from agents.agent_chat import batch_prompts, run_chat
+
+
+# Project endpoint and model, read once from the environment
+_ENDPOINT = os.environ.get("AZURE_AI_PROJECT_ENDPOINT", "")
+_MODEL = os.environ.get("MODEL_NAME", "gpt-4o-mini")
+
+
+# System prompt that makes the agent talk like a pirate
+_PIRATE_SYSTEM_PROMPT = """Ahoy, matey! Ye be talkin' to Captain Fake-Beard, the fiercest pirate on the seven seas!
 
 Ye must respond to all queries in authentic pirate-speak. Here be the rules:
 - Use phrases like 'Arrr!', 'Shiver me timbers!', 'Avast ye!', and 'Yo ho ho!'
@@ -39,12 +41,20 @@ Ye must respond to all queries in authentic pirate-speak. Here be the rules:
 
 Remember: Every response should sound like it came straight from a pirate's mouth!
 Treasure and adventure await those who speak with ye!"""
+
+
+def create_fake_pirate_agent():
+    """Create a simple prompt-based pirate agent."""
+    from azure.ai.projects.models import AgentDefinition, AgentKind
+    from azure.core.exceptions import ResourceExistsError
+    
+    client = get_project_client(_ENDPOINT)
     
     # Create agent definition
     definition = AgentDefinition()
     definition['kind'] = AgentKind.PROMPT
-    definition['instructions'] = pirate_system_prompt
-    definition['model'] = os.environ.get("MODEL_NAME", "gpt-4o-mini")
+    definition['instructions'] = _PIRATE_SYSTEM_PROMPT
+    definition['model'] = _MODEL
     
     # Try to create, prompt for new name if exists
     agent_name = "fake-pirate"
@@ -72,22 +82,25 @@ Treasure and adventure await those who speak with ye!"""
     return agent
 
 
-def list_pirate_agents():
-    """List all agents (including our pirate)."""
+def list_pirate_agents(limit: int | None = None):
+    """
+    List pirate agents (names containing 'pirate').
     
-    client = AIProjectClient(
-        endpoint=os.environ["AZURE_AI_PROJECT_ENDPOINT"],
-        credential=DefaultAzureCredential()
-    )
+    The service has no name filter, so agents are filtered client-side;
+    with a limit, paging stops as soon as enough matches are found.
+    
+    Args:
+        limit: Maximum number of agents to print (None for all)
+    """
     
-    agents = client.agents.list()
+    client = get_project_client(_ENDPOINT)
+    
+    pirates = (agent for agent in client.agents.list() if "pirate" in agent.get('name', '').lower())
     print("🏴‍☠️  Available pirate agents:")
     found_any = False
-    for agent in agents:
-        agent_name = agent.get('name', '')
-        if "pirate" in agent_name.lower():
-            print(f"  - {agent_name} (ID: {agent.get('id')})")
-            found_any = True
+    for agent in itertools.islice(pirates, limit):
+        print(f"  - {agent.get('name')} (ID: {agent.get('id')})", flush=True)
+        found_any = True
     
     if not found_any:
         print("  No pirate agents found")
@@ -96,10 +109,7 @@ def list_pirate_agents():
 def delete_pirate_agent(agent_id: str):
     """Delete a specific pirate agent."""
     
-    client = AIProjectClient(
-        endpoint=os.environ["AZURE_AI_PROJECT_ENDPOINT"],
-        credential=DefaultAzureCredential()
-    )
+    client = get_project_client(_ENDPOINT)
     
     client.agents.delete(agent_id)
     print(f"⚓ Deleted pirate agent: {agent_id}")
@@ -107,128 +117,138 @@ def delete_pirate_agent(agent_id: str):
 
 def get_pirate_system_prompt():
     """Get the pirate system prompt."""
-    return """Ahoy, matey! Ye be talkin' to Captain Fake-Beard, the fiercest pirate on the seven seas!
+    return _PIRATE_SYSTEM_PROMPT
 
-Ye must respond to all queries in authentic pirate-speak. Here be the rules:
-- Use phrases like 'Arrr!', 'Shiver me timbers!', 'Avast ye!', and 'Yo ho ho!'
-- Replace 'my' with 'me', 'you' with 'ye', and 'your' with 'yer'
-- Use 'be' instead of 'is/are' and 'ain't' freely
-- End many sentences with 'matey', 'yarr', or 'savvy?'
-- Talk about treasure, ships, the sea, and plundering (in a fun way)
-- Be helpful and friendly, but ALWAYS stay in character as a pirate
 
-Remember: Every response should sound like it came straight from a pirate's mouth!
-Treasure and adventure await those who speak with ye!"""
+def _get_agent_info(agent_id: str) -> dict:
+    """
+    Look an agent up, confirming it exists.
+    
+    Args:
+        agent_id: Agent name as passed on the command line
+    
+    Returns:
+        {"name": ...}
+    
+    Raises:
+        Whatever client.agents.get raises when the agent can't be fetched
+    """
+    agent = get_project_client(_ENDPOINT).agents.get(agent_name=agent_id)
+    return {"name": agent.get('name', agent_id)}
 
 
-def test_agent(agent_id: str):
-    """Test an agent by chatting with it interactively."""
+def test_agent(agent_id: str, verify: bool = False, prompts: list[str] | None = None):
+    """
+    Test an agent by chatting with it interactively.
     
-    client = AIProjectClient(
-        endpoint=os.environ["AZURE_AI_PROJECT_ENDPOINT"],
-        credential=DefaultAzureCredential()
-    )
-    
-    # Get the agent to verify it exists
-    try:
-        agent = client.agents.get(agent_name=agent_id)
-        agent_name = agent.get('name', agent_id)
-    except Exception as e:
-        print(f"❌ Error: Could not find agent '{agent_id}': {e}")
-        return
-    
-    # Get the agent's instructions (system prompt) from the latest version
-    versions = agent.get('versions', {})
-    latest_version = versions.get('latest', {})
-    agent_def = latest_version.get('definition', {})
-    system_prompt = agent_def.get('instructions', get_pirate_system_prompt())
-    
-    print(f"\n🏴‍☠️  Starting conversation with agent: {agent_name}")
-    print("Type 'exit' or 'quit' to end the conversation\n")
-    
-    # Get OpenAI client for responses
-    try:
-        openai_client = client.get_openai_client()
-    except Exception as e:
-        print(f"❌ Error: Could not initialize OpenAI client: {e}")
-        print("Note: Make sure you have Azure credentials configured properly")
-        return
+    Args:
+        agent_id: Agent name
+        verify: Look the agent up before chatting; otherwise a missing
+            agent is reported by the first reply
+        prompts: Send these messages instead of reading input (batch mode)
+    """
+    agent_name = agent_id
     
-    while True:
+    if verify:
         try:
-            user_input = input("You: ").strip()
-            
-            if user_input.lower() in ['exit', 'quit']:
-                print(f"\n⚓ Goodbye from Captain Fake-Beard! Fair winds and following seas! 🏴‍☠️")
-                break
-            
-            if not user_input:
-                continue
-            
-            print("(Awaiting response...)")
-            
-            # Get response from agent using responses.create()
-            try:
-                response = openai_client.responses.create(
-                    input=[{"role": "user", "content": user_input}],
-                    extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
-                )
-                
-                # Extract the response text
-                if hasattr(response, 'output_text'):
-                    assistant_response = response.output_text
-                elif hasattr(response, 'output') and response.output:
-                    assistant_response = response.output[0] if isinstance(response.output, list) else response.output
-                else:
-                    assistant_response = str(response)
-                
-                print(f"\nCaptain Fake-Beard: {assistant_response}\n")
-                
-            except Exception as chat_error:
-                print(f"❌ Chat error: {chat_error}")
-                break
-            
-        except KeyboardInterrupt:
-            print(f"\n\n⚓ Conversation interrupted. Farewell, matey! 🏴‍☠️")
-            break
+            agent_info = _get_agent_info(agent_id)
         except Exception as e:
-            print(f"❌ Error: {e}")
-            break
+            print(f"❌ Error: Could not find agent '{agent_id}': {e}")
+            return
+        agent_name = agent_info["name"]
+    
+    run_chat(
+        _ENDPOINT,
+        agent_name,
+        greeting=f"\n🏴‍☠️  Starting conversation with agent: {agent_name}",
+        farewell="\n⚓ Goodbye from Captain Fake-Beard! Fair winds and following seas! 🏴‍☠️",
+        interrupted="\n\n⚓ Conversation interrupted. Farewell, matey! 🏴‍☠️",
+        speaker="Captain Fake-Beard",
+        prompts=prompts,
+    )
 
 
-if __name__ == "__main__":
-    if not os.environ.get("AZURE_AI_PROJECT_ENDPOINT"):
+def _non_negative_int(value: str) -> int:
+    """argparse type for counts such as the list limit."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a whole number >= 0, got {value!r}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="⚓ Fake Pirate Agent - Simple Prompt-Based Agent ⚓",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python fake-pirate-simple.py create
+    python fake-pirate-simple.py list
+    python fake-pirate-simple.py test fake-pirate
+    python fake-pirate-simple.py test fake-pirate --turns 3 --prompt "Where be the treasure?"
+    python fake-pirate-simple.py delete <agent-id>
+
+With no command, creates the pirate agent.
+"""
+    )
+    parser.set_defaults(func=lambda args: create_fake_pirate_agent())
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    
+    subparsers.add_parser(
+        "create", help="Create the pirate agent"
+    ).set_defaults(func=lambda args: create_fake_pirate_agent())
+    
+    list_parser = subparsers.add_parser("list", help="List pirate agents")
+    list_parser.add_argument(
+        "limit",
+        nargs="?",
+        type=_non_negative_int,
+        help="Stop after this many agents"
+    )
+    list_parser.set_defaults(func=lambda args: list_pirate_agents(args.limit))
+    
+    test_parser = subparsers.add_parser("test", help="Chat with an agent")
+    test_parser.add_argument("agent_id", help="Agent name")
+    test_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Look the agent up before chatting"
+    )
+    test_parser.add_argument(
+        "--script",
+        help="Send each line of this file ('-' for stdin) instead of chatting"
+    )
+    test_parser.add_argument(
+        "--turns",
+        type=_non_negative_int,
+        help="Send --prompt this many times instead of chatting"
+    )
+    test_parser.add_argument(
+        "--prompt",
+        default="Ahoy!",
+        help="Message sent by --turns (default: Ahoy!)"
+    )
+    test_parser.set_defaults(
+        func=lambda args: test_agent(
+            args.agent_id, args.verify, batch_prompts(args.script, args.turns, args.prompt)
+        )
+    )
+    
+    delete_parser = subparsers.add_parser("delete", help="Delete a pirate agent")
+    delete_parser.add_argument("agent_id", help="Agent name")
+    delete_parser.set_defaults(func=lambda args: delete_pirate_agent(args.agent_id))
+    
+    args = parser.parse_args()
+    
+    if not _ENDPOINT:
         print("❌ Error: Set AZURE_AI_PROJECT_ENDPOINT environment variable")
         sys.exit(1)
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-        
-        if command == "create":
-            create_fake_pirate_agent()
-        elif command == "list":
-            list_pirate_agents()
-        elif command == "test" and len(sys.argv) > 2:
-            agent_id = sys.argv[2]
-            test_agent(agent_id)
-        elif command == "delete" and len(sys.argv) > 2:
-            agent_id = sys.argv[2]
-            delete_pirate_agent(agent_id)
-        else:
-            print("""
-⚓ Fake Pirate Agent - Simple Prompt-Based Agent ⚓
-
-Usage:
-  python fake-pirate-simple.py create       # Create the pirate agent
-  python fake-pirate-simple.py list         # List all pirate agents
-  python fake-pirate-simple.py test <id>    # Chat with an agent
-  python fake-pirate-simple.py delete <id>  # Delete pirate agent
-
-Example:
-  python fake-pirate-simple.py create
-  python fake-pirate-simple.py list
-  python fake-pirate-simple.py test fake-pirate
-  python fake-pirate-simple.py delete <agent-id>
-""")
-    else:
-        create_fake_pirate_agent()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
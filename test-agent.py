@@ -8,23 +8,69 @@ Usage:
 
 Or use the .agent.txt file:
     python test-agent.py agents/examples/math-tutor.agent.txt
+
+Batch mode (no typing - e.g. for timing runs):
+    python test-agent.py math-tutor.agent.txt --turns 5 --prompt "What is 2+2?"
+    python test-agent.py math-tutor.agent.txt --script questions.txt
 """
 
+import argparse
+import importlib.util
 import sys
 from pathlib import Path
+from typing import Optional
+
+# Add agents module to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Check dependencies before importing - find_spec only locates the modules,
+# so the slow Azure SDK imports wait until a client is created
+def _is_installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        # Parent package (e.g. azure.ai) missing
+        return False
+
 
-# Check dependencies before importing
-try:
-    from azure.identity import DefaultAzureCredential
-    from azure.ai.projects import AIProjectClient
-except ImportError as e:
-    print(f"\n❌ Missing required Python dependencies: {e}")
+_missing = [m for m in ("azure.ai.projects", "azure.identity", "openai") if not _is_installed(m)]
+if _missing:
+    print(f"\n❌ Missing required Python dependencies: {', '.join(_missing)}")
     print("\n   Install with:")
     print("   pip install azure-ai-projects==2.0.0b3 azure-identity openai")
     print("\n   Or if you have requirements.txt:")
     print("   pip install -r requirements.txt")
     sys.exit(1)
 
+from agents.agent_chat import batch_prompts, run_chat
+
+
+# Code shown after a chat ends (str.format template - literal braces doubled)
+_CODE_SAMPLE_TEMPLATE = """
+# Install requirements:
+#   pip install azure-ai-projects azure-identity
+
+from azure.identity import DefaultAzureCredential
+from azure.ai.projects import AIProjectClient
+
+# Connect to Azure AI project
+client = AIProjectClient(
+    endpoint="{endpoint}",
+    credential=DefaultAzureCredential()
+)
+
+# Get OpenAI client for the responses API
+openai_client = client.get_openai_client()
+
+# Chat with the agent
+response = openai_client.responses.create(
+    input=[{{"role": "user", "content": "Your message here"}}],
+    extra_body={{"agent": {{"name": "{agent_name}", "type": "agent_reference"}}}},
+)
+
+print(response.output_text)
+"""
+
 
 def parse_agent_file(file_path: str) -> tuple[str, str]:
     """
@@ -33,20 +79,38 @@ def parse_agent_file(file_path: str) -> tuple[str, str]:
     Returns:
         (agent_name, endpoint)
     """
-    content = Path(file_path).read_text()
+    return parse_agent_content(Path(file_path).read_text(), file_path)
+
+
+def parse_agent_content(content: str, source: str = "<string>") -> tuple[str, str]:
+    """
+    Extract agent name and endpoint from .agent.txt content.
     
+    Args:
+        content: File content
+        source: Where the content came from, for error messages
+    
+    Returns:
+        (agent_name, endpoint)
+    """
     agent_name = None
     endpoint = None
     
+    # Header lines come first, so stop as soon as both fields are found
     for line in content.splitlines():
-        line = line.strip()
-        if line.startswith("Agent ID:"):
-            agent_name = line.split(":", 1)[1].strip()
-        elif line.startswith("Endpoint:"):
-            endpoint = line.split(":", 1)[1].strip()
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip()
+        if key == "Agent ID":
+            agent_name = value.strip()
+        elif key == "Endpoint":
+            endpoint = value.strip()
+        if agent_name and endpoint:
+            break
     
     if not agent_name or not endpoint:
-        raise ValueError(f"Could not parse agent name and endpoint from {file_path}")
+        raise ValueError(f"Could not parse agent name and endpoint from {source}")
     
     return agent_name, endpoint
 
@@ -56,131 +120,123 @@ def print_code_sample(agent_name: str, endpoint: str):
     print("\n" + "=" * 60)
     print(" Code to replicate this chat")
     print("=" * 60)
-    print("""
-# Install requirements:
-#   pip install azure-ai-projects azure-identity
+    print(_CODE_SAMPLE_TEMPLATE.format(agent_name=agent_name, endpoint=endpoint))
 
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-
-# Connect to Azure AI project
-client = AIProjectClient(
-    endpoint=\"""" + endpoint + """\",
-    credential=DefaultAzureCredential()
-)
 
-# Get OpenAI client for the responses API
-openai_client = client.get_openai_client()
+def test_agent(agent_name: str, endpoint: str, prompts: Optional[list[str]] = None) -> Optional[Exception]:
+    """
+    Test an agent by chatting with it interactively.
+    
+    Args:
+        agent_name: Agent to talk to
+        endpoint: Project endpoint URL
+        prompts: Send these messages instead of reading input (batch mode)
+        
+    Returns:
+        The error that ended the chat, or None if it finished normally
+    """
+    
+    print(f"\n🤖 Connecting to agent '{agent_name}'...")
+    print(f"   Endpoint: {endpoint}")
+    
+    # No up-front agents.get - a missing agent fails the first reply instead
+    chat_error = run_chat(endpoint, agent_name, prompts=prompts)
+    
+    # Print code sample after a successful chat
+    if chat_error is None:
+        print_code_sample(agent_name, endpoint)
+    return chat_error
 
-# Chat with the agent
-response = openai_client.responses.create(
-    input=[{"role": "user", "content": "Your message here"}],
-    extra_body={"agent": {"name": \"""" + agent_name + """\", "type": "agent_reference"}},
-)
 
-print(response.output_text)
-""")
+def _non_negative_int(value: str) -> int:
+    """argparse type for counts such as --turns."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a whole number >= 0, got {value!r}")
+    return number
 
 
-def test_agent(agent_name: str, endpoint: str):
-    """Test an agent by chatting with it interactively."""
+def main():
+    parser = argparse.ArgumentParser(
+        description="Test an Azure AI Agent interactively",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python test-agent.py math-tutor https://myresource.services.ai.azure.com/api/projects/myproject
+    python test-agent.py agents/examples/math-tutor.agent.txt
+    python test-agent.py math-tutor.agent.txt --turns 5 --prompt "What is 2+2?"
+    python test-agent.py math-tutor.agent.txt --script questions.txt
+"""
+    )
     
-    print(f"\n🤖 Connecting to agent '{agent_name}'...")
-    print(f"   Endpoint: {endpoint}")
+    parser.add_argument(
+        "agent",
+        help="Agent name, or an .agent.txt file"
+    )
     
-    client = AIProjectClient(
-        endpoint=endpoint,
-        credential=DefaultAzureCredential()
+    parser.add_argument(
+        "endpoint",
+        nargs="?",
+        help="Project endpoint (not needed with an .agent.txt file)"
     )
     
-    # Verify agent exists
-    try:
-        agent = client.agents.get(agent_name=agent_name)
-        print(f"   ✅ Agent found: {agent.get('name')}")
-    except Exception as e:
-        print(f"\n❌ Error: Could not find agent '{agent_name}': {e}")
-        return
+    parser.add_argument(
+        "--script",
+        help="Send each line of this file ('-' for stdin) instead of chatting"
+    )
     
-    # Get OpenAI client for responses
-    try:
-        openai_client = client.get_openai_client()
-    except Exception as e:
-        print(f"\n❌ Error: Could not initialize OpenAI client: {e}")
-        return
+    parser.add_argument(
+        "--turns",
+        type=_non_negative_int,
+        help="Send --prompt this many times instead of chatting"
+    )
     
-    print(f"\n💬 Starting conversation with '{agent_name}'")
-    print("   Type 'exit' or 'quit' to end, Ctrl+C to interrupt\n")
-    print("-" * 50)
+    parser.add_argument(
+        "--prompt",
+        default="Hello!",
+        help="Message sent by --turns (default: Hello!)"
+    )
     
-    while True:
-        try:
-            user_input = input("\nYou: ").strip()
-            
-            if user_input.lower() in ['exit', 'quit']:
-                print("\n👋 Goodbye!")
-                break
-            
-            if not user_input:
-                continue
-            
-            # Get response from agent
-            try:
-                response = openai_client.responses.create(
-                    input=[{"role": "user", "content": user_input}],
-                    extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
-                )
-                
-                # Extract the response text
-                if hasattr(response, 'output_text'):
-                    assistant_response = response.output_text
-                elif hasattr(response, 'output') and response.output:
-                    assistant_response = response.output[0] if isinstance(response.output, list) else response.output
-                else:
-                    assistant_response = str(response)
-                
-                print(f"\n{agent_name}: {assistant_response}")
-                
-            except Exception as chat_error:
-                print(f"\n❌ Chat error: {chat_error}")
-                break
-            
-        except KeyboardInterrupt:
-            print("\n\n👋 Conversation interrupted. Goodbye!")
-            break
-        except EOFError:
-            print("\n\n👋 Goodbye!")
-            break
+    args = parser.parse_args()
     
-    # Print code sample after chat ends
-    print_code_sample(agent_name, endpoint)
-
-
-def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        print("\nExamples:")
-        print("  python test-agent.py math-tutor https://myresource.services.ai.azure.com/api/projects/myproject")
-        print("  python test-agent.py agents/examples/math-tutor.agent.txt")
-        sys.exit(1)
+    # Check if first arg is a file (read it directly - no separate exists() check)
+    content = None
+    if args.endpoint is None:
+        try:
+            content = Path(args.agent).read_text()
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error parsing file: {e}")
+            sys.exit(1)
     
-    # Check if first arg is a file
-    if len(sys.argv) == 2 and Path(sys.argv[1]).exists():
-        file_path = sys.argv[1]
+    if content is not None:
+        file_path = args.agent
         try:
-            agent_name, endpoint = parse_agent_file(file_path)
+            agent_name, endpoint = parse_agent_content(content, file_path)
             print(f"📄 Loaded from: {file_path}")
         except Exception as e:
             print(f"❌ Error parsing file: {e}")
             sys.exit(1)
-    elif len(sys.argv) >= 3:
-        agent_name = sys.argv[1]
-        endpoint = sys.argv[2]
+    elif args.endpoint:
+        agent_name = args.agent
+        endpoint = args.endpoint
     else:
         print("❌ Error: Provide either an .agent.txt file or agent-name + endpoint")
-        print(__doc__)
+        parser.print_usage()
         sys.exit(1)
     
-    test_agent(agent_name, endpoint)
+    try:
+        prompts = batch_prompts(args.script, args.turns, args.prompt)
+    except OSError as e:
+        print(f"❌ Error reading script: {e}")
+        sys.exit(1)
+    
+    if test_agent(agent_name, endpoint, prompts) is not None:
+        sys.exit(1)
 
 
 if __name__ == "__main__":